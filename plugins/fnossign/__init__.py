@@ -1,13 +1,16 @@
 import re
 import time
 import hashlib
+import logging
+import threading
+import uuid
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 
 import pytz
-import requests
-from bs4 import BeautifulSoup
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from fastapi.responses import StreamingResponse
 
 from app.core.config import settings
 from app.plugins import _PluginBase
@@ -15,6 +18,11 @@ from typing import Any, List, Dict, Tuple, Optional
 from app.log import logger
 from app.schemas import NotificationType
 
+from .jkju import CachingAdapter, CooldownTracker, EventLogger, FAILURE_CREDENTIAL, HourlyStats, JingKeJuClient, \
+    LeaseStore, ProxyPool, RetryQueue, RunProfiler, SessionPool, SignSummary, STATUS_FAILED, STATUS_SUCCESS, \
+    TranscriptRecorder, csv_lines, filter_history, ndjson_lines, parse_accounts, parse_day, parse_window, \
+    run_accounts, run_concurrently
+
 
 class JingKeJuSignin(_PluginBase):
     # 插件名称
@@ -24,7 +32,7 @@ class JingKeJuSignin(_PluginBase):
     # 插件图标
     plugin_icon = "https://raw.githubusercontent.com/wdcmz/MoviePilot-Plugins/main/icons/fnos.ico"
     # 插件版本
-    plugin_version = "1.0.0"
+    plugin_version = "1.20.0"
     # 插件作者
     plugin_author = "改编自用户提供代码"
     # 作者主页
@@ -40,28 +48,71 @@ class JingKeJuSignin(_PluginBase):
     _enabled = False
     # 任务执行间隔
     _cron = None
+    # 签到时间模式：cron 按签到周期执行；adaptive 在时间窗口内按各小时的签到耗时和失败率自动选择签到时间
+    _schedule_mode = "cron"
+    _adaptive_window = "8-22"
+    _hourly: Optional[HourlyStats] = None
     _onlyonce = False
     _notify = False
+    _notify_failure_now = False  # 失败时是否立即单独通知
     _history_days = None
     # 重试相关
     _retry_count = 0  # 最大重试次数
-    _current_retry = 0  # 当前重试次数
+    _retry_counts: Dict[str, int] = {}  # 各账号当前重试次数
     _retry_interval = 2  # 重试间隔(小时)
+    # 冷却相关：验证码、账号密码错误时账号进入冷却，冷却期内不再尝试登录
+    _cooldown_hours = 6  # 基础冷却时间(小时)，0表示不冷却
+    _cooldown: Optional[CooldownTracker] = None
     # 代理相关
     _use_proxy = True  # 是否使用代理，默认启用
+    _proxy_list = ""  # 代理列表，每行一个，为空时使用系统代理
+    _proxy_check_interval = 30  # 代理健康检查间隔(分钟)
+    _proxy_pool: Optional[ProxyPool] = None
+    # 并发签到账号数
+    _max_workers = 3
+    # 多实例租约：多个MoviePilot实例共用同一个租约文件，每个账号每天只由一个实例签到
+    _lease_path = ""
+    _lease: Optional[LeaseStore] = None
     # 用户名密码
     _username = None
     _password = None
     _is_email = False  # 是否使用邮箱登录
+    _accounts = ""  # 额外账号，每行一个：账号#密码[#email]
+    # 性能剖析：统计每次签到的耗时和内存分配，保留最近10次
+    _profile = False
+    _profiler: Optional[RunProfiler] = None
+    # 请求记录：记录每次签到的请求和响应，可用main.py --replay离线回放
+    _record_transcript = False
+    _recorder: Optional[TranscriptRecorder] = None
+    # 预热的请求记录文件，使用预热会话签到时接着写入，记录中包含登录和获取签到页的请求
+    _warm_transcript: Optional[str] = None
+    # 保留最近多少个请求记录文件
+    _transcript_keep = 10
+    # 待写入的历史记录，每轮签到结束后批量写入
+    _history_buffer: List[Dict[str, Any]] = []
+    _history_lock = threading.Lock()
+    # 签到摘要，随历史记录写入更新，供仪表盘读取
+    _summary: Optional[SignSummary] = None
+    # 本轮签到结果，用于汇总通知
+    _cycle_results: List[Dict[str, Any]] = []
+    # 重试队列，按论坛零点截止时间压缩重试间隔
+    _retry_queue: Optional[RetryQueue] = None
+
+    # 签到客户端
+    _client: Optional[JingKeJuClient] = None
+    # 预热：在定时签到前多少分钟提前登录并获取formhash，0表示不预热
+    _prewarm_minutes = 0
+    # 提前预热的上限(分钟)，过早登录的会话到签到时可能已失效
+    _max_prewarm_minutes = 720
+    _warm_sessions: Dict[str, Dict[str, Any]] = {}
 
-    # 网站相关常量
-    LOGIN_PAGE = "https://www.jkju.cc/member.php"
-    LOGIN_URL = "https://www.jkju.cc/member.php"
-    SIGN_URL = "https://www.jkju.cc/plugin.php"
-    SIGN_PAGE_URL = "https://www.jkju.cc/plugin.php?id=zqlj_sign"
+    # 结构化事件日志：签到线程只写入队列，由后台线程写入MoviePilot日志，高频事件限流
+    _events: Optional[EventLogger] = None
 
     # 定时器
     _scheduler: Optional[BackgroundScheduler] = None
+    # 当前生效的配置，重新加载配置时只应用有变化的部分
+    _applied_config: Optional[Dict[str, Any]] = None
 
     def init_plugin(self, config: dict = None):
         """
@@ -71,62 +122,271 @@ class JingKeJuSignin(_PluginBase):
         if config:
             self._enabled = config.get("enabled", False)
             self._notify = config.get("notify", False)
+            self._notify_failure_now = config.get("notify_failure_now", False)
             self._cron = config.get("cron", "30 9 * * *")
+            self._schedule_mode = config.get("schedule_mode") or "cron"
+            self._adaptive_window = (config.get("adaptive_window") or "8-22").strip()
             self._onlyonce = config.get("onlyonce", False)
             self._history_days = config.get("history_days", 30)
             self._retry_count = int(config.get("retry_count", 0))
             self._retry_interval = int(config.get("retry_interval", 2))
             self._use_proxy = config.get("use_proxy", True)
+            self._proxy_list = config.get("proxy_list", "")
+            self._proxy_check_interval = int(config.get("proxy_check_interval") or 30)
             self._username = config.get("username", "")
             self._password = config.get("password", "")
             self._is_email = config.get("is_email", False)
-        
+            self._accounts = config.get("accounts", "")
+            self._max_workers = int(config.get("max_workers") or 3)
+            self._prewarm_minutes = min(max(int(config.get("prewarm_minutes") or 0), 0), self._max_prewarm_minutes)
+            self._cooldown_hours = float(config.get("cooldown_hours", 6) or 0)
+            self._lease_path = (config.get("lease_path") or "").strip()
+            self._profile = config.get("profile", False)
+            self._record_transcript = config.get("record_transcript", False)
+
+        applied = self._config_state()
+        # 定时器运行中时只应用有变化的配置，保留重试队列、预热会话和剖析结果
+        if self._scheduler and self._scheduler.running and self._applied_config is not None:
+            changed = {key for key, value in applied.items() if self._applied_config.get(key) != value}
+            self._applied_config = applied
+            self._apply_changes(changed)
+        else:
+            self._setup()
+            self._applied_config = applied
+
+        # 立即运行一次
+        if self._onlyonce:
+            self._run_once(config)
+
+        # 启动任务，恢复重试时可能已启动
+        if self._scheduler.get_jobs() and not self._scheduler.running:
+            self._scheduler.start()
+
+    def _config_state(self) -> Dict[str, Any]:
+        """
+        当前生效的配置，用于和下一次配置比较，不含一次性开关
+        """
+        return {
+            "enabled": self._enabled,
+            "notify": self._notify,
+            "notify_failure_now": self._notify_failure_now,
+            "cron": self._cron,
+            "schedule_mode": self._schedule_mode,
+            "adaptive_window": self._adaptive_window,
+            "history_days": self._history_days,
+            "retry_count": self._retry_count,
+            "retry_interval": self._retry_interval,
+            "use_proxy": self._use_proxy,
+            "proxy_list": self._proxy_list,
+            "proxy_check_interval": self._proxy_check_interval,
+            "username": self._username,
+            "password": self._password,
+            "is_email": self._is_email,
+            "accounts": self._accounts,
+            "max_workers": self._max_workers,
+            "prewarm_minutes": self._prewarm_minutes,
+            "cooldown_hours": self._cooldown_hours,
+            "lease_path": self._lease_path,
+            "profile": self._profile,
+            "record_transcript": self._record_transcript
+        }
+
+    def _setup(self):
+        """
+        完整初始化：停止现有任务，重建定时器、客户端并恢复持久化的状态
+        """
         # 重置重试计数
-        self._current_retry = 0
-        
-        # 停止现有任务
+        self._retry_counts = {}
+        self._cycle_results = []
+        self._retry_queue = RetryQueue(self._retry_interval, self._retry_count)
+        # 剖析结果在重新加载配置后保留
+        if not self._profiler:
+            self._profiler = RunProfiler()
+        # 恢复账号冷却状态
+        self._cooldown = CooldownTracker(self._cooldown_hours, state=self.get_data('cooldown'))
+        self._clear_disabled_cooldowns()
+        # 恢复各小时的签到统计
+        self._hourly = HourlyStats(self.get_data('hourly_stats'))
+
+        # 停止现有任务，写入未保存的历史记录，写入失败时保留在缓冲区中，下次写入时重试
         self.stop_service()
-        
+        self._history_buffer = list(self._history_buffer)
+        self._summary = self._load_summary()
+        self._events = EventLogger(logger)
+        self._events.start()
+
         # 确保scheduler是新的
         self._scheduler = BackgroundScheduler(timezone=settings.TZ)
-        
-        # 立即运行一次
-        if self._onlyonce:
-            logger.info(f"镜客居签到服务启动，立即运行一次")
-            self._scheduler.add_job(
-                func=self.__signin, 
-                trigger='date',
-                run_date=datetime.now(tz=pytz.timezone(settings.TZ)) + timedelta(seconds=3),
-                name="镜客居签到"
-            )
-            # 关闭一次性开关
-            self._onlyonce = False
-            self.update_config({
-                "onlyonce": False,
-                "cron": self._cron,
-                "enabled": self._enabled,
-                "notify": self._notify,
-                "history_days": self._history_days,
-                "retry_count": self._retry_count,
-                "retry_interval": self._retry_interval,
-                "use_proxy": self._use_proxy,
-                "username": self._username,
-                "password": self._password,
-                "is_email": self._is_email
-            })
+
+        # 初始化代理池，后台定时检查代理健康状态
+        self._proxy_pool = self._init_proxy_pool()
+        self._init_client()
+        self._lease = self._init_lease()
+        self._schedule_proxy_check()
+
+        # 定时签到和签到前预热会话
+        self._schedule_signin()
+        self._schedule_prewarm_job()
+
+        # 恢复重启前未执行的重试，补签错过的定时签到
+        if self._enabled and not self._onlyonce:
+            self._restore_retries()
+            if self._cron or self._is_adaptive():
+                self._schedule_catchup()
+
+    def _apply_changes(self, changed: set):
+        """
+        只应用有变化的配置：只调整受影响的任务和组件，重试队列和无关账号的预热会话保持不变
+        """
+        if not changed:
+            logger.info("镜客居签到配置未变化")
+            return
+        # 只记录变化的配置项，不输出配置值，避免密码写入日志
+        logger.info(f"镜客居签到配置已更新：{', '.join(sorted(changed))}")
+        schedule_keys = {"enabled", "cron", "schedule_mode", "adaptive_window"}
+        account_keys = {"username", "password", "is_email", "accounts"}
+
+        if changed & {"retry_count", "retry_interval"}:
+            self._retry_queue.interval = self._retry_interval
+            self._retry_queue.max_attempts = self._retry_count
+        if "cooldown_hours" in changed:
+            self._cooldown.hours = self._cooldown_hours
+            self._clear_disabled_cooldowns()
+        if "lease_path" in changed:
+            self._lease = self._init_lease()
+        if changed & {"use_proxy", "proxy_list"}:
+            self._proxy_pool = self._init_proxy_pool()
+            self._client.proxy_pool = self._proxy_pool
+        if changed & {"enabled", "use_proxy", "proxy_list", "proxy_check_interval"}:
+            self._schedule_proxy_check()
+        if "record_transcript" in changed:
+            # 会话池的传输适配器变化，重建客户端，原有的预热会话随旧客户端关闭
+            self._init_client()
+        elif changed & account_keys:
+            # 账号或密码变化后预热会话的登录状态不再可信
+            self._release_warm_sessions()
+
+        if changed & schedule_keys:
+            self._schedule_signin()
+        if "prewarm_minutes" in changed:
+            self._client.warm_ttl = self._warm_ttl()
+        if changed & (schedule_keys | account_keys | {"prewarm_minutes"}):
+            self._schedule_prewarm_job()
+        if "enabled" in changed:
+            if self._enabled:
+                self._schedule_retry()
+            else:
+                self._remove_job("jingkeju_retry")
+        if not self._enabled:
+            self._remove_job("jingkeju_catchup")
+        elif changed & (schedule_keys | account_keys) and (self._cron or self._is_adaptive()):
+            self._schedule_catchup()
+
+    def _run_once(self, config: dict = None):
+        """
+        立即运行一次，并关闭一次性开关
+        """
+        logger.info(f"镜客居签到服务启动，立即运行一次")
+        if self._proxy_pool and not self._scheduler.get_job("jingkeju_proxy_check"):
+            self._schedule_proxy_check()
+        self._scheduler.add_job(
+            func=self.__signin,
+            trigger='date',
+            run_date=datetime.now(tz=pytz.timezone(settings.TZ)) + timedelta(seconds=3),
+            id="jingkeju_onlyonce",
+            replace_existing=True,
+            name="镜客居签到"
+        )
+        # 关闭一次性开关，其余配置按收到的原样保存
+        self._onlyonce = False
+        self.update_config({**(config or {}), "onlyonce": False})
+
+    def _init_client(self):
+        """
+        创建签到客户端，开启请求记录时由记录器包装传输适配器
+        """
+        old_client = self._client
+        self._release_warm_sessions()
+        self._recorder = TranscriptRecorder(CachingAdapter()) if self._record_transcript else None
+        self._client = JingKeJuClient(proxy_pool=self._proxy_pool, logger=self._events,
+                                      session_pool=SessionPool(adapter=self._recorder) if self._recorder else None,
+                                      warm_ttl=self._warm_ttl())
+        # 签到进行中时旧客户端仍在使用，不关闭
+        if old_client and not getattr(self, '_signing_in', False):
+            old_client.close()
+
+    def _warm_ttl(self) -> int:
+        """
+        预热会话的有效期(秒)：覆盖提前预热的时间，并留出签到任务延迟执行的余量
+        """
+        return max(JingKeJuClient.WARM_TTL, (self._prewarm_minutes + 10) * 60)
+
+    def _clear_disabled_cooldowns(self):
+        """
+        关闭冷却后解除并保存全部账号的冷却状态，避免已冷却的账号继续被跳过
+        """
+        if not self._cooldown.enabled and self._cooldown.clear():
+            self.save_data(key="cooldown", value=self._cooldown.to_dict())
+
+    def _release_warm_sessions(self):
+        """
+        归还全部预热会话
+        """
+        self._warm_transcript = None
+        for username in list(self._warm_sessions):
+            warm = self._warm_sessions.pop(username)
+            if self._client:
+                self._client.release(warm)
+
+    def _remove_job(self, job_id: str):
+        if self._scheduler and self._scheduler.get_job(job_id):
+            self._scheduler.remove_job(job_id)
+
+    def _schedule_proxy_check(self):
+        """
+        按检查间隔安排代理健康检查，未使用代理或插件未启用时取消
+        """
+        self._remove_job("jingkeju_proxy_check")
+        if not self._proxy_pool or not (self._enabled or self._onlyonce):
+            return
+        self._scheduler.add_job(
+            func=self._proxy_pool.check,
+            trigger='interval',
+            minutes=self._proxy_check_interval,
+            next_run_time=datetime.now(tz=pytz.timezone(settings.TZ)) + timedelta(seconds=1),
+            id="jingkeju_proxy_check",
+            name="镜客居代理检测"
+        )
+
+    def _schedule_signin(self):
+        """
+        按签到周期或自适应时间安排定时签到
+        """
+        self._remove_job("jingkeju_signin")
+        self._remove_job("jingkeju_adaptive")
+        if not self._enabled:
+            return
+        # 自适应选择签到时间
+        if self._is_adaptive():
+            self._schedule_adaptive()
         # 周期运行
-        elif self._cron and self._enabled:
+        elif self._cron:
             logger.info(f"镜客居签到服务启动，周期：{self._cron}")
             self._scheduler.add_job(
                 func=self.__signin,
-                trigger=CronTrigger.from_crontab(self._cron),
+                trigger=self._cron_trigger(),
+                id="jingkeju_signin",
+                replace_existing=True,
                 name="镜客居签到"
             )
 
-        # 启动任务
-        if self._scheduler.get_jobs():
-            self._scheduler.print_jobs()
-            self._scheduler.start()
+    def _schedule_prewarm_job(self):
+        """
+        按当前配置安排或取消签到前预热
+        """
+        self._remove_job("jingkeju_prewarm")
+        if self._enabled and (self._cron or self._is_adaptive()) and self._prewarm_minutes > 0:
+            self._schedule_prewarm()
 
     def _send_notification(self, title, text):
         """
@@ -139,426 +399,789 @@ class JingKeJuSignin(_PluginBase):
                 text=text
             )
 
-    def _schedule_retry(self, hours=None):
+    def _record_result(self, username: str, success: bool, status: str, trend: str = "", skipped: bool = False):
         """
-        安排重试任务
-        :param hours: 重试间隔小时数，如果不指定则使用配置的_retry_interval
+        记录单个账号的签到结果，本轮结束后统一汇总通知
+        失败且开启了立即通知时，单独发送一条失败通知
+        :param skipped: 账号冷却中，本轮未尝试签到
+        """
+        notified = False
+        if not success and not skipped and self._notify and self._notify_failure_now:
+            cooling = self._cooldown.active(username) if self._cooldown else None
+            if cooling:
+                # 冷却中的账号不会重试
+                until = datetime.fromtimestamp(cooling["until"]).strftime('%Y-%m-%d %H:%M')
+                detail = (
+                    f"⏸ 冷却信息\n"
+                    f"• 冷却至：{until}\n"
+                    f"• 冷却期内不再重试，请检查账号后在插件中解除冷却\n"
+                )
+            else:
+                retry_current = self._retry_counts.get(username, 0)
+                # 重试时间由重试队列按论坛零点截止时间压缩，不一定等于重试间隔
+                next_retry = self._retry_queue.due_of(username) if self._retry_queue else None
+                detail = (
+                    f"🔄 重试信息\n"
+                    f"• 当前重试次数：{retry_current}/{self._retry_count}\n"
+                    + (f"• 下次重试：{next_retry.astimezone(pytz.timezone(settings.TZ)).strftime('%Y-%m-%d %H:%M')}\n"
+                       if next_retry else "• 今日不再重试\n")
+                )
+            self._send_notification(
+                title="【❌ 镜客居签到失败】",
+                text=(
+                    f"📢 执行结果\n"
+                    f"━━━━━━━━━━\n"
+                    f"🕐 时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                    f"👤 账号：{username}\n"
+                    f"❌ 状态：{status}\n"
+                    f"━━━━━━━━━━\n"
+                    f"{detail}"
+                    f"━━━━━━━━━━"
+                )
+            )
+            notified = True
+
+        self._cycle_results.append({
+            "username": username,
+            "success": success,
+            "status": status,
+            "trend": trend,
+            "skipped": skipped,
+            "notified": notified
+        })
+
+    def _flush_notifications(self):
+        """
+        将本轮所有账号的签到结果合并为一条汇总通知
+        """
+        results, self._cycle_results = self._cycle_results, []
+        if not self._notify or not results:
+            return
+        # 失败结果均已单独通知过，不再重复发送
+        if all(result["notified"] for result in results):
+            return
+
+        success_count = sum(1 for result in results if result["success"])
+        skipped_count = sum(1 for result in results if result["skipped"])
+        failure_count = len(results) - success_count - skipped_count
+        if failure_count == 0 and skipped_count == 0:
+            title = "【✅ 镜客居签到结果】"
+        elif success_count == 0 and failure_count:
+            title = "【❌ 镜客居签到失败】"
+        else:
+            title = "【⚠️ 镜客居签到结果】"
+
+        rows = "\n".join(
+            f"{'✅' if result['success'] else '⏸' if result['skipped'] else '❌'} "
+            f"{result['username']}｜{result['status']}"
+            for result in results
+        )
+        text = (
+            f"📢 执行结果\n"
+            f"━━━━━━━━━━\n"
+            f"🕐 时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"✨ 成功：{success_count}　❌ 失败：{failure_count}"
+            f"{f'　⏸ 冷却：{skipped_count}' if skipped_count else ''}\n"
+            f"━━━━━━━━━━\n"
+            f"👤 账号明细\n"
+            f"{rows}\n"
+            f"━━━━━━━━━━"
+        )
+        # 单账号时保留签到趋势
+        if len(results) == 1 and results[0]["trend"]:
+            text += (
+                f"\n📊 签到趋势\n"
+                f"{results[0]['trend']}\n"
+                f"━━━━━━━━━━"
+            )
+        next_retry = self._retry_queue.next_due() if failure_count else None
+        if next_retry:
+            text += (
+                f"\n🔄 重试信息\n"
+                f"• 最大重试次数：{self._retry_count}\n"
+                f"• 下次重试：{next_retry.astimezone(pytz.timezone(settings.TZ)).strftime('%Y-%m-%d %H:%M')}\n"
+                f"━━━━━━━━━━"
+            )
+        self._send_notification(title=title, text=text)
+
+    def _schedule_retry(self):
+        """
+        按重试队列中最近的重试时间安排重试任务，队列为空时取消
         """
         if not self._scheduler:
             self._scheduler = BackgroundScheduler(timezone=settings.TZ)
 
-        # 计算下次重试时间
-        retry_interval = hours if hours is not None else self._retry_interval
-        next_run_time = datetime.now(tz=pytz.timezone(settings.TZ)) + timedelta(hours=retry_interval)
-        
-        # 安排重试任务
+        # 保存重试队列，重启后恢复
+        self.save_data(key="retry_state", value={
+            "queue": self._retry_queue.entries(),
+            "counts": self._retry_counts
+        })
+
+        next_run_time = self._retry_queue.next_due()
+        if not next_run_time:
+            if self._scheduler.get_job("jingkeju_retry"):
+                self._scheduler.remove_job("jingkeju_retry")
+            return
+        # 重启后恢复的重试可能已到期，稍后立即执行
+        next_run_time = max(next_run_time, datetime.now(tz=pytz.timezone(settings.TZ)) + timedelta(seconds=3))
+
         self._scheduler.add_job(
-            func=self.__signin, 
+            func=self.__retry,
             trigger='date',
             run_date=next_run_time,
-            name=f"镜客居签到重试 ({self._current_retry}/{self._retry_count})"
+            id="jingkeju_retry",
+            replace_existing=True,
+            name="镜客居签到重试"
         )
-        
-        logger.info(f"镜客居签到失败，将在{retry_interval}小时后重试，当前重试次数: {self._current_retry}/{self._retry_count}")
-        
+        logger.info(f"镜客居签到将于{next_run_time.astimezone(pytz.timezone(settings.TZ)).strftime('%Y-%m-%d %H:%M:%S')}"
+                    f"重试，待重试账号{len(self._retry_queue)}个")
+
         # 启动定时器（如果未启动）
         if not self._scheduler.running:
             self._scheduler.start()
 
-    def _get_proxies(self):
+    def _restore_retries(self):
         """
-        获取代理设置
+        恢复重启前保存的重试队列
+        """
+        state = self.get_data('retry_state') or {}
+        if not state.get("queue") or self._retry_count <= 0:
+            return
+        restored = self._retry_queue.restore(state["queue"], datetime.now(tz=pytz.timezone(settings.TZ)))
+        if not restored:
+            return
+        self._retry_counts = {username: count for username, count in (state.get("counts") or {}).items()
+                              if self._retry_queue.due_of(username)}
+        logger.info(f"镜客居签到已恢复{restored}个待重试账号")
+        self._schedule_retry()
+
+    def _schedule_catchup(self):
+        """
+        补签：今天的定时签到时间已过，但有账号今天还没有任何签到记录（定时签到时MoviePilot未运行），稍后立即签到
+        """
+        tz = pytz.timezone(settings.TZ)
+        now = datetime.now(tz=tz)
+        if self._is_adaptive():
+            fire_time = self._hourly.choose_time(now.date(), *self._window(), tzinfo=tz)
+        else:
+            today = tz.localize(datetime(now.year, now.month, now.day))
+            fire_time = self._cron_trigger().get_next_fire_time(None, today)
+        if not fire_time or fire_time > now:
+            # 修改签到周期后之前安排的补签可能已不需要
+            self._remove_job("jingkeju_catchup")
+            return
+
+        # 今天已签到成功或已经尝试过的账号，失败的由重试队列处理
+        attempted = set(self._summary.attempted())
+        missing = [account["username"] for account in self._get_accounts()
+                   if account["username"] not in attempted
+                   and not self._cooldown.active(account["username"])
+                   and not self._retry_queue.due_of(account["username"])]
+        if not missing:
+            self._remove_job("jingkeju_catchup")
+            return
+
+        run_date = now + timedelta(seconds=10)
+        self._scheduler.add_job(
+            func=self.__signin,
+            trigger='date',
+            run_date=run_date,
+            kwargs={"usernames": missing},
+            id="jingkeju_catchup",
+            replace_existing=True,
+            name="镜客居签到补签"
+        )
+        logger.info(f"镜客居签到今日定时签到（{fire_time.strftime('%H:%M')}）已错过，"
+                    f"将于{run_date.strftime('%H:%M:%S')}补签，账号: {', '.join(missing)}")
+
+    def __retry(self):
+        """
+        执行到期的重试
+        """
+        if getattr(self, '_signing_in', False):
+            # 正在签到，稍后再取出到期的重试
+            self._scheduler.add_job(
+                func=self.__retry,
+                trigger='date',
+                run_date=datetime.now(tz=pytz.timezone(settings.TZ)) + timedelta(minutes=1),
+                id="jingkeju_retry",
+                replace_existing=True,
+                name="镜客居签到重试"
+            )
+            return
+        due = self._retry_queue.pop_due(datetime.now(tz=pytz.timezone(settings.TZ)))
+        if due:
+            self.__signin(usernames=[username for username, _ in due])
+        else:
+            self._schedule_retry()
+
+    def _schedule_prewarm(self, after: datetime = None):
+        """
+        在下一次定时签到前安排预热任务
+        :param after: 只考虑该时间之后的定时签到
+        """
+        tz = pytz.timezone(settings.TZ)
+        now = datetime.now(tz=tz)
+        lead = timedelta(minutes=self._prewarm_minutes)
+        fire_time = self._next_fire_time(max(now, after + timedelta(seconds=1)) if after else now)
+        if not fire_time:
+            return
+        # 已进入预热窗口时立即预热
+        run_date = max(fire_time - lead, now + timedelta(seconds=3))
+        self._scheduler.add_job(
+            func=self.__prewarm,
+            trigger='date',
+            run_date=run_date,
+            kwargs={"fire_time": fire_time},
+            id="jingkeju_prewarm",
+            replace_existing=True,
+            name="镜客居签到预热"
+        )
+        logger.info(f"镜客居签到将于{run_date.strftime('%Y-%m-%d %H:%M:%S')}预热，"
+                    f"签到时间{fire_time.strftime('%Y-%m-%d %H:%M:%S')}")
+
+    def _next_fire_time(self, after: datetime) -> Optional[datetime]:
+        """
+        after之后的下一次定时签到时间
+        """
+        if self._is_adaptive():
+            return self._adaptive_fire_time(after)
+        if not self._cron:
+            return None
+        return self._cron_trigger().get_next_fire_time(None, after)
+
+    def _cron_trigger(self) -> CronTrigger:
+        """
+        签到周期的触发器，统一使用MoviePilot设置的时区，补签、预热和定时任务按同一时区计算
+        """
+        return CronTrigger.from_crontab(self._cron, timezone=pytz.timezone(settings.TZ))
+
+    def _is_adaptive(self) -> bool:
+        return self._schedule_mode == "adaptive"
+
+    def _window(self) -> Tuple[int, int]:
+        """
+        自适应签到的时间窗口，格式错误时使用默认的8-22点
+        """
+        try:
+            return parse_window(self._adaptive_window)
+        except ValueError:
+            logger.error(f"镜客居签到时间窗口格式错误：{self._adaptive_window}，使用默认的8-22点")
+            return 8, 22
+
+    def _adaptive_fire_time(self, after: datetime) -> datetime:
+        """
+        自适应模式下after之后的签到时间：每天在时间窗口内选择代价最低的小时，今天已签到过则从明天开始选择
+        """
+        tz = pytz.timezone(settings.TZ)
+        after = after.astimezone(tz)
+        day = after.date()
+        last = self.get_data('adaptive_last')
+        if last and last >= day.isoformat():
+            day = datetime.strptime(last, '%Y-%m-%d').date() + timedelta(days=1)
+        while True:
+            fire_time = self._hourly.choose_time(day, *self._window(), tzinfo=tz)
+            if fire_time >= after:
+                return fire_time
+            day += timedelta(days=1)
+
+    def _schedule_adaptive(self):
+        """
+        安排下一次自适应签到
+        """
+        fire_time = self._adaptive_fire_time(datetime.now(tz=pytz.timezone(settings.TZ)))
+        self._scheduler.add_job(
+            func=self.__adaptive_signin,
+            trigger='date',
+            run_date=fire_time,
+            kwargs={"fire_time": fire_time},
+            id="jingkeju_adaptive",
+            replace_existing=True,
+            name="镜客居签到"
+        )
+        logger.info(f"镜客居签到服务启动，自适应签到时间：{fire_time.strftime('%Y-%m-%d %H:%M')}")
+
+    def __adaptive_signin(self, fire_time: datetime = None):
+        """
+        自适应签到：签到后根据最新的统计选择下一天的签到时间
+        """
+        if fire_time:
+            self.save_data(key="adaptive_last", value=fire_time.date().isoformat())
+        try:
+            self.__signin()
+        finally:
+            if self._scheduler:
+                self._schedule_adaptive()
+                # 下一次签到时间可能已变化，重新安排预热
+                if self._prewarm_minutes > 0:
+                    self._schedule_prewarm()
+
+    def __prewarm(self, fire_time: datetime = None):
+        """
+        预热：提前登录并获取签到页formhash，签到时只需发送签到请求
+        """
+        recorder = self._recorder
+        try:
+            accounts = [account for account in self._get_accounts()
+                        if not self._cooldown.active(account["username"])]
+            # 已有的预热会话先归还会话池，预热时复用其登录状态
+            for username in list(self._warm_sessions):
+                self._client.release(self._warm_sessions.pop(username))
+            # 预热的请求单独记录，签到时接着写入同一个文件，回放时才有完整的登录过程
+            if recorder and not getattr(self, '_signing_in', False):
+                self._warm_transcript = recorder.path = self._new_transcript_path()
+            for username, warm in run_concurrently(self._prewarm_account, accounts, workers=self._max_workers):
+                if warm:
+                    self._warm_sessions[username] = warm
+            logger.info(f"镜客居签到预热完成，{len(self._warm_sessions)}/{len(accounts)}个账号已就绪")
+        finally:
+            if recorder and recorder.path == self._warm_transcript:
+                recorder.path = None
+            if self._scheduler and fire_time:
+                self._schedule_prewarm(after=fire_time)
+
+    def _prewarm_account(self, account: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        预热单个账号，会话池中已有登录状态有效的会话时无需重新登录
+        """
+        username = account["username"]
+        warm, failure = self._client.prepare(account)
+        if failure:
+            self._events.event("prewarm_failed", "预热失败，签到时将重新登录", logging.WARNING, account=username,
+                               reason=failure['message'])
+        return username, warm
+
+    def _init_proxy_pool(self) -> Optional[ProxyPool]:
+        """
+        初始化代理池：优先使用配置的代理列表，否则使用系统代理
         """
         if not self._use_proxy:
             logger.info("未启用代理")
             return None
-            
-        try:
-            # 获取系统代理设置
+
+        proxies = [line.strip() for line in (self._proxy_list or "").splitlines() if line.strip()]
+        if not proxies:
             if hasattr(settings, 'PROXY') and settings.PROXY:
-                logger.info(f"使用系统代理: {settings.PROXY}")
-                return settings.PROXY
+                proxies = [settings.PROXY]
             else:
                 logger.warning("系统代理未配置")
                 return None
+
+        pool = ProxyPool(proxies, check_url=JingKeJuClient.BASE_URL,
+                         timeout=JingKeJuClient.REQUEST_TIMEOUT[0])
+        logger.info(f"镜客居签到代理池已初始化，共{len(pool)}个代理")
+        return pool
+
+    def _new_transcript_path(self) -> str:
+        """
+        本次签到的请求记录文件，只保留最近的若干个
+        """
+        directory = self.get_data_path() / "transcripts"
+        directory.mkdir(parents=True, exist_ok=True)
+        for old in sorted(directory.glob("*.jsonl"))[:-(self._transcript_keep - 1) or None]:
+            old.unlink(missing_ok=True)
+        path = directory / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl"
+        logger.info(f"镜客居签到请求记录: {path}")
+        return str(path)
+
+    def _init_lease(self) -> Optional[LeaseStore]:
+        """
+        初始化多实例租约，未配置租约文件时不启用
+        """
+        if not self._lease_path:
+            return None
+        try:
+            lease = LeaseStore(self._lease_path)
+            lease.prune()
         except Exception as e:
-            logger.error(f"获取代理设置出错: {str(e)}")
+            logger.error(f"镜客居签到租约文件初始化失败，将不使用租约: {str(e)}")
             return None
+        logger.info(f"镜客居签到已启用多实例租约，实例标识: {lease.owner}")
+        return lease
 
-    def __signin(self):
+    def _get_accounts(self) -> List[Dict[str, Any]]:
         """
-        镜客居签到主方法
+        获取全部签到账号：主账号 + 额外账号
+        额外账号每行一个，格式：账号#密码，邮箱登录时追加 #email
+        """
+        accounts = []
+        if self._username and self._password:
+            accounts.append({
+                "username": self._username,
+                "password": self._password,
+                "is_email": self._is_email
+            })
+        for account in parse_accounts(self._accounts):
+            if any(item["username"] == account["username"] for item in accounts):
+                continue
+            accounts.append(account)
+        return accounts
+
+    def __signin(self, usernames: List[str] = None):
+        """
+        镜客居签到主方法，并发为各账号签到，结束后汇总通知
+        :param usernames: 仅为指定账号签到（重试时使用），不指定则为全部账号签到
         """
         # 增加任务锁，防止重复执行
         if hasattr(self, '_signing_in') and self._signing_in:
             logger.info("已有签到任务在执行，跳过当前任务")
             return
-            
-        self._signing_in = True
-        try:
-            # 检查用户名密码是否配置
-            if not self._username or not self._password:
-                logger.error("未配置用户名密码，无法进行签到")
-                if self._notify:
-                    self._send_notification(
-                        title="【❌ 镜客居签到失败】",
-                        text=(
-                            f"📢 执行结果\n"
-                            f"━━━━━━━━━━\n"
-                            f"🕐 时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-                            f"❌ 状态：签到失败，未配置用户名密码\n"
-                            f"━━━━━━━━━━\n"
-                            f"💡 配置方法\n"
-                            f"• 在插件设置中填写镜客居论坛用户名和密码\n"
-                            f"━━━━━━━━━━"
-                        )
-                    )
-                return False
-                
-            # 初始化会话
-            session = requests.Session()
-            proxies = self._get_proxies()
-            session.proxies = proxies if proxies else {}
-            
-            # 登录表单数据
-            login_form_data = {
-                "referer": "https://www.jkju.cc/",
-                "questionid": 0,
-                "answer": "",
-                "cookietime": "2592000",
-                "username": self._username,
-                "password": self._password,
-                "loginfield": "email" if self._is_email else "username"
-            }
-            
-            login_headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                              "AppleWebKit/537.36 (KHTML, like Gecko) "
-                              "Chrome/140.0.0.0 Safari/537.36 Edg/140.0.0.0",
-                "Origin": "https://www.jkju.cc",
-                "Referer": "https://www.jkju.cc/member.php?mod=logging&action=login",
-            }
-            
-            # 登录参数
-            login_params = {
-                "mod": "logging",
-                "action": "login",
-                "loginsubmit": "yes",
-                "inajax": 1,
-            }
-            
-            # 获取登录哈希
-            try:
-                resp = session.get(
-                    self.LOGIN_PAGE, 
-                    params={"mod": "logging", "action": "login"}
-                )
-                if resp.status_code == 403:
-                    resp = session.get(
-                        self.LOGIN_PAGE, 
-                        params={"mod": "logging", "action": "login"}
-                    )
-                
-                soup = BeautifulSoup(resp.text, "html.parser")
-                form_tag = soup.find("form", {"name": "login"})
-                if not form_tag:
-                    logger.error("无法找到登录表单")
-                    self._handle_sign_failure("无法找到登录表单")
-                    return False
-                    
-                formhash = form_tag.find("input", {"name": "formhash", "type": "hidden"}).get("value")
-                loginhash = form_tag.get("action").split("&")[-1].split("=")[-1]
-                
-                login_form_data["formhash"] = formhash
-                login_params["loginhash"] = loginhash
-                
-            except Exception as e:
-                logger.error(f"获取登录哈希失败: {str(e)}")
-                self._handle_sign_failure(f"获取登录信息失败: {str(e)}")
-                return False
-            
-            # 执行登录
-            try:
-                resp = session.post(
-                    self.LOGIN_URL,
-                    params=login_params,
-                    data=login_form_data,
-                    headers=login_headers,
-                )
-                
-                if resp.status_code == 403:
-                    session.cookies.clear_expired_cookies()
-                    resp = session.post(
-                        self.LOGIN_URL,
-                        params=login_params,
-                        data=login_form_data,
-                        headers=login_headers,
-                    )
-                
-                text = resp.text
-                if "请输入验证码继续登录" in text:
-                    logger.error("登录需要验证码")
-                    self._handle_sign_failure("登录需要验证码，请手动登录一次")
-                    return False
-                if "欢迎您回来" not in text:
-                    logger.error("登录失败，未找到欢迎信息")
-                    self._handle_sign_failure("登录失败，用户名或密码可能不正确")
-                    return False
-                    
-                logger.info("登录成功")
-                
-            except Exception as e:
-                logger.error(f"登录过程出错: {str(e)}")
-                self._handle_sign_failure(f"登录过程出错: {str(e)}")
-                return False
-            
-            # 获取签到页面
-            try:
-                sign_page_html = session.get(self.SIGN_PAGE_URL).text
-                if not sign_page_html:
-                    logger.error("获取签到页面失败")
-                    self._handle_sign_failure("获取签到页面失败")
-                    return False
-            except Exception as e:
-                logger.error(f"获取签到页面出错: {str(e)}")
-                self._handle_sign_failure(f"获取签到页面出错: {str(e)}")
-                return False
-            
-            # 检查是否已签到
-            try:
-                soup = BeautifulSoup(sign_page_html, "html.parser")
-                sign_status_text = soup.find("div", class_="bm signbtn cl").find("a").text
-                if "今日已打卡" in sign_status_text:
-                    logger.info("今日已签到")
-                    
-                    # 获取签到趋势
-                    trend_text = self._get_sign_trend(sign_page_html)
-                    
-                    # 发送通知
-                    if self._notify:
-                        self._send_notification(
-                            title="【✅ 镜客居签到结果】",
-                            text=(
-                                f"📢 执行结果\n"
-                                f"━━━━━━━━━━\n"
-                                f"🕐 时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-                                f"✨ 状态：今日已签到\n"
-                                f"━━━━━━━━━━\n"
-                                f"📊 签到趋势\n"
-                                f"{trend_text}\n"
-                                f"━━━━━━━━━━"
-                            )
-                        )
-                    
-                    # 保存历史记录
-                    self._save_history({
-                        "date": datetime.today().strftime('%Y-%m-%d %H:%M:%S'),
-                        "status": "已签到",
-                        "trend": trend_text
-                    })
-                    
-                    # 重置重试计数
-                    self._current_retry = 0
-                    return True
-                    
-            except Exception as e:
-                logger.error(f"检查签到状态出错: {str(e)}")
-                self._handle_sign_failure(f"检查签到状态出错: {str(e)}")
-                return False
-            
-            # 执行签到
+
+        # 开启性能剖析时统计本次签到的耗时、各模块耗时和内存分配
+        profiling = self._profiler.session(f"签到 {', '.join(usernames) if usernames else '全部账号'}") \
+            if self._profile else nullcontext()
+        with profiling:
+            self._signing_in = True
+            # 本轮签到的运行编号，写入本轮的全部事件日志
+            self._events.run_id = uuid.uuid4().hex[:8]
+            run_start = time.monotonic()
             try:
-                # 获取签到哈希
-                soup = BeautifulSoup(sign_page_html, "html.parser")
-                form_tag = soup.find("form", {"id": "scbar_form"})
-                sign_hash = form_tag.find("input", {"name": "formhash", "type": "hidden"}).get("value")
-                
-                # 发送签到请求
-                sign_headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                                  "AppleWebKit/537.36 (KHTML, like Gecko) "
-                                  "Chrome/140.0.0.0 Safari/537.36 Edg/140.0.0.0",
-                    "Referer": "https://www.jkju.cc/",
-                }
-                
-                resp = session.get(
-                    self.SIGN_URL,
-                    headers=sign_headers,
-                    params={"id": "zqlj_sign", "sign": sign_hash},
-                ).text
-                
-                # 检查签到结果
-                if "恭喜您，打卡成功！" in resp:
-                    logger.info("签到成功")
-                    
-                    # 重新获取签到页面以获取最新趋势
-                    sign_page_html = session.get(self.SIGN_PAGE_URL).text
-                    trend_text = self._get_sign_trend(sign_page_html)
-                    
-                    # 发送通知
-                    if self._notify:
-                        self._send_notification(
-                            title="【✅ 镜客居签到成功】",
-                            text=(
-                                f"📢 执行结果\n"
-                                f"━━━━━━━━━━\n"
-                                f"🕐 时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-                                f"✨ 状态：签到成功\n"
-                                f"━━━━━━━━━━\n"
-                                f"📊 签到趋势\n"
-                                f"{trend_text}\n"
-                                f"━━━━━━━━━━"
-                            )
-                        )
-                    
-                    # 保存历史记录
-                    self._save_history({
-                        "date": datetime.today().strftime('%Y-%m-%d %H:%M:%S'),
-                        "status": "签到成功",
-                        "trend": trend_text
-                    })
-                    
-                    # 重置重试计数
-                    self._current_retry = 0
-                    return True
-                elif "您今天已经打过卡了，请勿重复操作！" in resp:
-                    logger.info("今日已签到")
-                    
-                    # 获取签到趋势
-                    trend_text = self._get_sign_trend(sign_page_html)
-                    
-                    # 发送通知
+                accounts = self._get_accounts()
+                if usernames:
+                    accounts = [account for account in accounts if account["username"] in usernames]
+                # 检查用户名密码是否配置
+                if not accounts:
+                    logger.error("未配置用户名密码，无法进行签到")
                     if self._notify:
                         self._send_notification(
-                            title="【✅ 镜客居签到结果】",
+                            title="【❌ 镜客居签到失败】",
                             text=(
                                 f"📢 执行结果\n"
                                 f"━━━━━━━━━━\n"
                                 f"🕐 时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-                                f"✨ 状态：今日已签到\n"
+                                f"❌ 状态：签到失败，未配置用户名密码\n"
                                 f"━━━━━━━━━━\n"
-                                f"📊 签到趋势\n"
-                                f"{trend_text}\n"
+                                f"💡 配置方法\n"
+                                f"• 在插件设置中填写镜客居论坛用户名和密码\n"
                                 f"━━━━━━━━━━"
                             )
                         )
-                    
-                    # 保存历史记录
-                    self._save_history({
-                        "date": datetime.today().strftime('%Y-%m-%d %H:%M:%S'),
-                        "status": "已签到",
-                        "trend": trend_text
-                    })
-                    
-                    # 重置重试计数
-                    self._current_retry = 0
-                    return True
-                else:
-                    logger.error(f"签到失败，响应内容: {resp[:200]}")
-                    self._handle_sign_failure("签到失败，未知错误")
                     return False
-                    
-            except Exception as e:
-                logger.error(f"执行签到出错: {str(e)}")
-                self._handle_sign_failure(f"执行签到出错: {str(e)}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"签到过程发生未知错误: {str(e)}")
-            self._handle_sign_failure(f"签到过程发生未知错误: {str(e)}")
+
+                self._cycle_results = []
+                self._events.event("run_start", "开始签到", accounts=len(accounts))
+                # 冷却中的账号不发起请求，仅在汇总中列出
+                accounts = self._skip_cooling_accounts(accounts)
+                # 取出预热好的会话，只使用一次
+                warm_sessions = {account["username"]: self._warm_sessions.pop(account["username"])
+                                 for account in accounts if account["username"] in self._warm_sessions}
+                if self._recorder:
+                    self._recorder.path = self._warm_transcript if warm_sessions and self._warm_transcript \
+                        else self._new_transcript_path()
+                self._warm_transcript = None
+                success = True
+                # 签到在线程池中并发执行，结果在当前线程中按完成顺序逐个处理
+                for result in run_accounts(self._client, accounts, workers=self._max_workers,
+                                           warm_sessions=warm_sessions, lease=self._lease,
+                                           wrap=self._profiler.wrap if self._profile else None):
+                    success = self._handle_sign_result(result) and success
+                return success
+            finally:
+                # 批量写入历史记录和签到统计，汇总通知并安排重试
+                self._flush_history()
+                self.save_data(key="hourly_stats", value=self._hourly.to_dict())
+                self._flush_notifications()
+                if self._recorder:
+                    self._recorder.path = None
+                self._schedule_retry()
+                self._events.event("run_end", "签到结束", elapsed=round(time.monotonic() - run_start, 3),
+                                   dropped=self._events.dropped or None)
+                self._events.run_id = None
+                # 释放锁
+                self._signing_in = False
+
+    def _skip_cooling_accounts(self, accounts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        跳过冷却中的账号，返回需要签到的账号
+        """
+        remaining = []
+        for account in accounts:
+            username = account["username"]
+            cooling = self._cooldown.active(username)
+            if not cooling:
+                remaining.append(account)
+                continue
+            until = datetime.fromtimestamp(cooling["until"]).strftime('%Y-%m-%d %H:%M')
+            self._events.event("cooldown_skip", f"冷却中，{until}前不再尝试签到", account=username,
+                               reason=cooling['reason'])
+            self._record_result(username, False, f"冷却中至{until}：{cooling['reason']}", skipped=True)
+            warm = self._warm_sessions.pop(username, None)
+            if warm:
+                self._client.release(warm)
+        return remaining
+
+    def _handle_sign_result(self, result: Dict[str, Any]) -> bool:
+        """
+        处理单个账号的签到结果
+        """
+        username = result["username"]
+        # 统计各小时的签到耗时和失败率，其他实例的结果和账号密码错误与签到时间无关
+        if not result.get("lease_owner") and result.get("failure") != FAILURE_CREDENTIAL:
+            self._hourly.record(datetime.now(tz=pytz.timezone(settings.TZ)).hour, result.get("elapsed"),
+                                result["status"] != STATUS_FAILED)
+        if result["status"] == STATUS_FAILED:
+            self._handle_sign_failure(username, result["message"], proxy=result.get("proxy"),
+                                      failure=result.get("failure"))
             return False
-        finally:
-            # 释放锁
-            self._signing_in = False
 
-    def _get_sign_trend(self, html: str) -> str:
-        """获取签到趋势信息"""
-        try:
-            soup = BeautifulSoup(html, "lxml")
-            trend_lis = soup.select('#wp > div.ct2.cl > div.sd > div:nth-of-type(3) > div.bm_c > ul > li')
-            if trend_lis:
-                return "\n".join(li.text.strip() for li in trend_lis[:5])  # 只取前5条
-            return "无法获取签到趋势"
-        except Exception as e:
-            logger.error(f"获取签到趋势出错: {str(e)}")
-            return "获取签到趋势失败"
+        self._record_result(username, True, result["message"], result["trend"])
 
-    def _handle_sign_failure(self, reason: str):
-        """处理签到失败情况"""
-        # 发送通知
-        if self._notify:
-            self._send_notification(
-                title="【❌ 镜客居签到失败】",
-                text=(
-                    f"📢 执行结果\n"
-                    f"━━━━━━━━━━\n"
-                    f"🕐 时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-                    f"❌ 状态：{reason}\n"
-                    f"━━━━━━━━━━\n"
-                    f"🔄 重试信息\n"
-                    f"• 最大重试次数：{self._retry_count}\n"
-                    f"• 重试间隔：{self._retry_interval}小时\n"
-                    f"━━━━━━━━━━"
-                )
-            )
-        
         # 保存历史记录
-        self._save_history({
+        record = {
             "date": datetime.today().strftime('%Y-%m-%d %H:%M:%S'),
+            "account": username,
+            "status": "签到成功" if result["status"] == STATUS_SUCCESS else "已签到",
+            "trend": result["trend"]
+        }
+        if result.get("proxy"):
+            record["proxy"] = result["proxy"]
+        self._save_history(record)
+
+        # 重置重试计数和冷却状态
+        self._retry_counts.pop(username, None)
+        self._retry_queue.remove(username)
+        if self._cooldown.clear(username):
+            self.save_data(key="cooldown", value=self._cooldown.to_dict())
+        return True
+
+    def _handle_sign_failure(self, username: str, reason: str, proxy: str = None, failure: str = None):
+        """
+        处理签到失败情况
+        :param failure: 失败类型，验证码、账号密码错误时账号进入冷却，不再安排重试
+        """
+        cooling = self._cooldown.record(username, failure, reason) if failure else None
+        current_retry = self._retry_counts.get(username, 0)
+        if cooling:
+            self._retry_counts.pop(username, None)
+            self._retry_queue.remove(username)
+            self.save_data(key="cooldown", value=self._cooldown.to_dict())
+            until = datetime.fromtimestamp(cooling["until"]).strftime('%Y-%m-%d %H:%M')
+            self._events.event("cooldown_enter", f"进入冷却，{until}前不再尝试签到", logging.WARNING, account=username,
+                               failure=failure, reason=reason)
+            reason = f"{reason}（冷却至{until}）"
+        # 加入重试队列，本轮结束后统一安排
+        elif self._retry_count > 0 and current_retry < self._retry_count:
+            current_retry += 1
+            retry_time = self._retry_queue.push(username, current_retry, datetime.now(tz=pytz.timezone(settings.TZ)))
+            if retry_time:
+                self._retry_counts[username] = current_retry
+                self._events.event("retry_scheduled", f"安排第{current_retry}次定时重试", account=username,
+                                   due=retry_time.astimezone(pytz.timezone(settings.TZ)).strftime('%H:%M:%S'))
+            else:
+                self._retry_counts.pop(username, None)
+                self._events.event("retry_dropped", "距离论坛零点不足，今日不再重试", logging.WARNING, account=username)
+        else:
+            self._retry_counts.pop(username, None)
+
+        # 记录结果，用于汇总通知
+        self._record_result(username, False, reason)
+
+        # 保存历史记录
+        record = {
+            "date": datetime.today().strftime('%Y-%m-%d %H:%M:%S'),
+            "account": username,
             "status": f"签到失败: {reason}",
             "trend": ""
-        })
-        
-        # 设置下次定时重试
-        if self._retry_count > 0 and self._current_retry < self._retry_count:
-            self._current_retry += 1
-            retry_hours = self._retry_interval * self._current_retry
-            logger.info(f"安排第{self._current_retry}次定时重试，将在{retry_hours}小时后重试")
-            self._schedule_retry(hours=retry_hours)
-        else:
-            self._current_retry = 0
+        }
+        if proxy:
+            record["proxy"] = proxy
+        self._save_history(record)
 
     def _save_history(self, record):
         """
-        保存签到历史记录
+        记录签到历史，先写入缓冲区，本轮签到结束后由_flush_history()批量保存
         """
-        # 读取历史记录
-        history = self.get_data('history') or []
-        
         # 如果是失败状态，添加重试信息
         if "失败" in record.get("status", ""):
             record["retry"] = {
                 "enabled": self._retry_count > 0,
-                "current": self._current_retry,
+                "current": self._retry_counts.get(record.get("account"), 0),
                 "max": self._retry_count,
                 "interval": self._retry_interval
             }
-        
-        # 添加新记录
-        history.append(record)
-        
-        # 保留指定天数的记录
-        if self._history_days:
+            retry_time = self._retry_queue.due_of(record.get("account"))
+            if retry_time:
+                record["retry"]["next"] = retry_time.astimezone(pytz.timezone(settings.TZ)).strftime('%H:%M')
+
+        with self._history_lock:
+            self._history_buffer.append(record)
+
+    def _flush_history(self):
+        """
+        将缓冲区中的历史记录一次性写入，读取、追加、清理、保存在锁内完成，避免并发写入丢失记录
+        """
+        with self._history_lock:
+            if not self._history_buffer:
+                return
+            records = self._history_buffer
+            self._history_buffer = []
             try:
-                days_ago = time.time() - int(self._history_days) * 24 * 60 * 60
-                history = [record for record in history if
-                          datetime.strptime(record["date"],
-                                         '%Y-%m-%d %H:%M:%S').timestamp() >= days_ago]
+                # 读取历史记录并追加
+                history = self.get_data('history') or []
+                history.extend(records)
+
+                # 保留指定天数的记录
+                if self._history_days:
+                    try:
+                        days_ago = time.time() - int(self._history_days) * 24 * 60 * 60
+                        history = [record for record in history if
+                                   datetime.strptime(record["date"],
+                                                     '%Y-%m-%d %H:%M:%S').timestamp() >= days_ago]
+                    except Exception as e:
+                        logger.error(f"清理历史记录异常: {str(e)}")
+
+                # 保存历史记录，同时更新签到摘要
+                self.save_data(key="history", value=history)
+                if self._summary:
+                    self._summary.update(records)
+                    self.save_data(key="summary", value=self._summary.to_dict())
             except Exception as e:
-                logger.error(f"清理历史记录异常: {str(e)}")
-        
-        # 保存历史记录
-        self.save_data(key="history", value=history)
+                # 保存失败时放回缓冲区，下次写入时重试
+                self._history_buffer = records + self._history_buffer
+                logger.error(f"保存签到历史记录失败: {str(e)}")
+
+    def _load_summary(self) -> SignSummary:
+        """
+        读取签到摘要，没有保存的摘要时由历史记录重建一次
+        """
+        state = self.get_data('summary')
+        if state is not None:
+            return SignSummary(state)
+        summary = SignSummary.from_history({**record, "account": record.get("account", self._username)}
+                                           for record in self.get_data('history') or [])
+        self.save_data(key="summary", value=summary.to_dict())
+        return summary
 
     def get_state(self) -> bool:
         return self._enabled
 
-    @staticmethod
-    def get_command() -> List[Dict[str, Any]]:
-        pass
+    @staticmethod
+    def get_command() -> List[Dict[str, Any]]:
+        pass
+
+    def get_api(self) -> List[Dict[str, Any]]:
+        """
+        注册插件API
+        """
+        return [
+            {
+                "path": "/cooldown",
+                "endpoint": self.get_cooldowns,
+                "methods": ["GET"],
+                "auth": "bear",
+                "summary": "查询账号冷却状态",
+                "description": "列出因验证码或账号密码错误进入冷却的账号"
+            },
+            {
+                "path": "/profiles",
+                "endpoint": self.get_profiles,
+                "methods": ["GET"],
+                "auth": "bear",
+                "summary": "查询签到性能剖析结果",
+                "description": "开启性能剖析后，返回最近几次签到耗时最多的函数、各模块耗时和内存分配最多的位置"
+            },
+            {
+                "path": "/hourly",
+                "endpoint": self.get_hourly_stats,
+                "methods": ["GET"],
+                "auth": "bear",
+                "summary": "查询各小时签到统计",
+                "description": "返回各小时的签到次数、失败次数、平均耗时和预期代价，以及自适应模式下的下一次签到时间"
+            },
+            {
+                "path": "/history/export",
+                "endpoint": self.export_history,
+                "methods": ["GET"],
+                "auth": "bear",
+                "summary": "导出签到历史",
+                "description": "以NDJSON或CSV流式导出签到历史，可按日期范围(YYYY-MM-DD，含首尾两天)和账号筛选"
+            },
+            {
+                "path": "/cooldown/clear",
+                "endpoint": self.clear_cooldown,
+                "methods": ["POST"],
+                "auth": "bear",
+                "summary": "解除账号冷却",
+                "description": "解除指定账号的冷却，不指定账号时解除全部账号，下次签到时重新尝试登录"
+            }
+        ]
+
+    def get_profiles(self, limit: int = 10) -> Dict[str, Any]:
+        """
+        API：查询最近的性能剖析结果，最新的在前
+        """
+        profiles = self._profiler.profiles() if self._profiler else []
+        return {"success": True, "data": profiles[:max(int(limit), 0)]}
+
+    def get_cooldowns(self) -> Dict[str, Any]:
+        """
+        API：查询账号冷却状态
+        """
+        now = time.time()
+        data = []
+        for username, entry in (self._cooldown.to_dict() if self._cooldown else {}).items():
+            data.append({
+                "username": username,
+                "failure": entry["failure"],
+                "reason": entry["reason"],
+                "count": entry["count"],
+                "since": datetime.fromtimestamp(entry["since"]).strftime('%Y-%m-%d %H:%M:%S'),
+                "until": datetime.fromtimestamp(entry["until"]).strftime('%Y-%m-%d %H:%M:%S'),
+                "active": entry["until"] > now
+            })
+        return {"success": True, "data": data}
+
+    def get_hourly_stats(self) -> Dict[str, Any]:
+        """
+        API：查询各小时的签到统计
+        """
+        if not self._hourly:
+            return {"success": False, "message": "插件未初始化"}
+        data = [{"hour": int(hour), **item, "cost": self._hourly.cost(int(hour))}
+                for hour, item in self._hourly.to_dict().items()]
+        next_time = None
+        if self._is_adaptive():
+            next_time = self._adaptive_fire_time(datetime.now(tz=pytz.timezone(settings.TZ)))
+        return {"success": True, "data": data,
+                "next": next_time.strftime('%Y-%m-%d %H:%M:%S') if next_time else None}
+
+    def export_history(self, fmt: str = "ndjson", start: str = None, end: str = None, account: str = None):
+        """
+        API：流式导出签到历史，逐条筛选并输出，不在内存中拼接整个导出文件
+        :param fmt: 导出格式，ndjson 或 csv
+        :param start: 开始日期，YYYY-MM-DD
+        :param end: 结束日期，YYYY-MM-DD
+        :param account: 只导出该账号的记录
+        """
+        if fmt not in ("ndjson", "csv"):
+            return {"success": False, "message": f"不支持的导出格式：{fmt}，可选ndjson、csv"}
+        try:
+            start, end = parse_day(start), parse_day(end)
+        except ValueError:
+            return {"success": False, "message": "日期格式错误，应为YYYY-MM-DD"}
+        records = filter_history(self.get_data('history') or [], start=start, end=end,
+                                 account=account or None, default_account=self._username)
+        filename = f"jingkeju_history_{datetime.now().strftime('%Y%m%d%H%M%S')}.{fmt}"
+        # 同步生成器由接口线程池逐块读取，不占用签到定时器的线程
+        return StreamingResponse(
+            csv_lines(records) if fmt == "csv" else ndjson_lines(records),
+            media_type="text/csv; charset=utf-8" if fmt == "csv" else "application/x-ndjson",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
 
-    def get_api(self) -> List[Dict[str, Any]]:
-        pass
+    def clear_cooldown(self, username: str = None) -> Dict[str, Any]:
+        """
+        API：解除账号冷却
+        :param username: 账号，不指定则解除全部账号
+        """
+        if not self._cooldown:
+            return {"success": False, "message": "插件未初始化"}
+        cleared = self._cooldown.clear(username or None)
+        self.save_data(key="cooldown", value=self._cooldown.to_dict())
+        if not cleared:
+            return {"success": False, "message": f"账号{username}未在冷却中" if username else "没有冷却中的账号"}
+        logger.info(f"已解除账号冷却: {', '.join(cleared)}")
+        return {"success": True, "message": f"已解除冷却：{', '.join(cleared)}", "data": cleared}
 
     def get_service(self) -> List[Dict[str, Any]]:
         """
@@ -566,11 +1189,12 @@ class JingKeJuSignin(_PluginBase):
         """
         services = []
         
-        if self._enabled and self._cron:
+        # 自适应模式的签到时间每天变化，由插件自己的定时器执行
+        if self._enabled and self._cron and not self._is_adaptive():
             services.append({
                 "id": "JingKeJuSignin",
                 "name": "镜客居签到服务",
-                "trigger": CronTrigger.from_crontab(self._cron),
+                "trigger": self._cron_trigger(),
                 "func": self.__signin,
                 "kwargs": {}
             })
@@ -626,7 +1250,7 @@ class JingKeJuSignin(_PluginBase):
                                                 'component': 'VCol',
                                                 'props': {
                                                     'cols': 12,
-                                                    'md': 4
+                                                    'md': 3
                                                 },
                                                 'content': [
                                                     {
@@ -642,7 +1266,7 @@ class JingKeJuSignin(_PluginBase):
                                                 'component': 'VCol',
                                                 'props': {
                                                     'cols': 12,
-                                                    'md': 4
+                                                    'md': 3
                                                 },
                                                 'content': [
                                                     {
@@ -658,7 +1282,24 @@ class JingKeJuSignin(_PluginBase):
                                                 'component': 'VCol',
                                                 'props': {
                                                     'cols': 12,
-                                                    'md': 4
+                                                    'md': 3
+                                                },
+                                                'content': [
+                                                    {
+                                                        'component': 'VSwitch',
+                                                        'props': {
+                                                            'model': 'notify_failure_now',
+                                                            'label': '失败立即通知',
+                                                            'hint': '关闭时失败结果并入本轮汇总通知'
+                                                        }
+                                                    }
+                                                ]
+                                            },
+                                            {
+                                                'component': 'VCol',
+                                                'props': {
+                                                    'cols': 12,
+                                                    'md': 3
                                                 },
                                                 'content': [
                                                     {
@@ -713,6 +1354,50 @@ class JingKeJuSignin(_PluginBase):
                                             }
                                         ]
                                     },
+                                    # 额外账号
+                                    {
+                                        'component': 'VRow',
+                                        'content': [
+                                            {
+                                                'component': 'VCol',
+                                                'props': {
+                                                    'cols': 12,
+                                                    'md': 9
+                                                },
+                                                'content': [
+                                                    {
+                                                        'component': 'VTextarea',
+                                                        'props': {
+                                                            'model': 'accounts',
+                                                            'label': '额外账号',
+                                                            'rows': 3,
+                                                            'placeholder': '每行一个账号，格式：账号#密码，邮箱登录追加 #email',
+                                                            'hint': '多账号签到，本轮结果合并为一条通知'
+                                                        }
+                                                    }
+                                                ]
+                                            },
+                                            {
+                                                'component': 'VCol',
+                                                'props': {
+                                                    'cols': 12,
+                                                    'md': 3
+                                                },
+                                                'content': [
+                                                    {
+                                                        'component': 'VTextField',
+                                                        'props': {
+                                                            'model': 'max_workers',
+                                                            'label': '并发账号数',
+                                                            'type': 'number',
+                                                            'placeholder': '3',
+                                                            'hint': '同时签到的账号数量'
+                                                        }
+                                                    }
+                                                ]
+                                            }
+                                        ]
+                                    },
                                     # 登录方式和签到周期
                                     {
                                         'component': 'VRow',
@@ -721,7 +1406,7 @@ class JingKeJuSignin(_PluginBase):
                                                 'component': 'VCol',
                                                 'props': {
                                                     'cols': 12,
-                                                    'md': 6
+                                                    'md': 4
                                                 },
                                                 'content': [
                                                     {
@@ -738,7 +1423,7 @@ class JingKeJuSignin(_PluginBase):
                                                 'component': 'VCol',
                                                 'props': {
                                                     'cols': 12,
-                                                    'md': 6
+                                                    'md': 4
                                                 },
                                                 'content': [
                                                     {
@@ -751,6 +1436,70 @@ class JingKeJuSignin(_PluginBase):
                                                         }
                                                     }
                                                 ]
+                                            },
+                                            {
+                                                'component': 'VCol',
+                                                'props': {
+                                                    'cols': 12,
+                                                    'md': 4
+                                                },
+                                                'content': [
+                                                    {
+                                                        'component': 'VTextField',
+                                                        'props': {
+                                                            'model': 'prewarm_minutes',
+                                                            'label': '提前预热(分钟)',
+                                                            'type': 'number',
+                                                            'placeholder': '0',
+                                                            'hint': '签到前提前登录并获取formhash，签到时只需一次请求，0表示不预热，最多720分钟'
+                                                        }
+                                                    }
+                                                ]
+                                            }
+                                        ]
+                                    },
+                                    # 签到时间模式
+                                    {
+                                        'component': 'VRow',
+                                        'content': [
+                                            {
+                                                'component': 'VCol',
+                                                'props': {
+                                                    'cols': 12,
+                                                    'md': 6
+                                                },
+                                                'content': [
+                                                    {
+                                                        'component': 'VSelect',
+                                                        'props': {
+                                                            'model': 'schedule_mode',
+                                                            'label': '签到时间',
+                                                            'items': [
+                                                                {'title': '按签到周期', 'value': 'cron'},
+                                                                {'title': '自适应', 'value': 'adaptive'}
+                                                            ],
+                                                            'hint': '自适应：在时间窗口内按各小时的签到耗时和失败率自动选择签到时间'
+                                                        }
+                                                    }
+                                                ]
+                                            },
+                                            {
+                                                'component': 'VCol',
+                                                'props': {
+                                                    'cols': 12,
+                                                    'md': 6
+                                                },
+                                                'content': [
+                                                    {
+                                                        'component': 'VTextField',
+                                                        'props': {
+                                                            'model': 'adaptive_window',
+                                                            'label': '自适应时间窗口',
+                                                            'placeholder': '8-22',
+                                                            'hint': '自适应签到的时间范围，如8-22表示8:00到22:59之间'
+                                                        }
+                                                    }
+                                                ]
                                             }
                                         ]
                                     },
@@ -797,7 +1546,7 @@ class JingKeJuSignin(_PluginBase):
                                             }
                                         ]
                                     },
-                                    # 重试间隔和代理设置
+                                    # 重试间隔、冷却时间和代理设置
                                     {
                                         'component': 'VRow',
                                         'content': [
@@ -805,7 +1554,7 @@ class JingKeJuSignin(_PluginBase):
                                                 'component': 'VCol',
                                                 'props': {
                                                     'cols': 12,
-                                                    'md': 6
+                                                    'md': 4
                                                 },
                                                 'content': [
                                                     {
@@ -824,7 +1573,26 @@ class JingKeJuSignin(_PluginBase):
                                                 'component': 'VCol',
                                                 'props': {
                                                     'cols': 12,
-                                                    'md': 6
+                                                    'md': 4
+                                                },
+                                                'content': [
+                                                    {
+                                                        'component': 'VTextField',
+                                                        'props': {
+                                                            'model': 'cooldown_hours',
+                                                            'label': '冷却时间(小时)',
+                                                            'type': 'number',
+                                                            'placeholder': '6',
+                                                            'hint': '出现验证码或账号密码错误时暂停该账号签到，连续出现时翻倍，0为不冷却'
+                                                        }
+                                                    }
+                                                ]
+                                            },
+                                            {
+                                                'component': 'VCol',
+                                                'props': {
+                                                    'cols': 12,
+                                                    'md': 4
                                                 },
                                                 'content': [
                                                     {
@@ -832,7 +1600,109 @@ class JingKeJuSignin(_PluginBase):
                                                         'props': {
                                                             'model': 'use_proxy',
                                                             'label': '使用代理',
-                                                            'hint': '与镜客居论坛通信时使用系统代理'
+                                                            'hint': '与镜客居论坛通信时使用代理，未配置代理列表时使用系统代理'
+                                                        }
+                                                    }
+                                                ]
+                                            }
+                                        ]
+                                    },
+                                    # 代理池设置
+                                    {
+                                        'component': 'VRow',
+                                        'content': [
+                                            {
+                                                'component': 'VCol',
+                                                'props': {
+                                                    'cols': 12,
+                                                    'md': 8
+                                                },
+                                                'content': [
+                                                    {
+                                                        'component': 'VTextarea',
+                                                        'props': {
+                                                            'model': 'proxy_list',
+                                                            'label': '代理列表',
+                                                            'rows': 3,
+                                                            'placeholder': '每行一个代理，如 http://127.0.0.1:7890',
+                                                            'hint': '按延迟和成功率自动选择，失败时自动切换'
+                                                        }
+                                                    }
+                                                ]
+                                            },
+                                            {
+                                                'component': 'VCol',
+                                                'props': {
+                                                    'cols': 12,
+                                                    'md': 4
+                                                },
+                                                'content': [
+                                                    {
+                                                        'component': 'VTextField',
+                                                        'props': {
+                                                            'model': 'proxy_check_interval',
+                                                            'label': '代理检测间隔(分钟)',
+                                                            'type': 'number',
+                                                            'placeholder': '30',
+                                                            'hint': '后台检测代理可用性和延迟的间隔'
+                                                        }
+                                                    }
+                                                ]
+                                            }
+                                        ]
+                                    },
+                                    # 多实例租约、性能剖析和请求记录
+                                    {
+                                        'component': 'VRow',
+                                        'content': [
+                                            {
+                                                'component': 'VCol',
+                                                'props': {
+                                                    'cols': 12,
+                                                    'md': 6
+                                                },
+                                                'content': [
+                                                    {
+                                                        'component': 'VTextField',
+                                                        'props': {
+                                                            'model': 'lease_path',
+                                                            'label': '多实例租约文件',
+                                                            'placeholder': '/shared/jingkeju_lease.db',
+                                                            'hint': '多个MoviePilot实例填写同一个共享目录下的文件，每个账号每天只由一个实例签到，其他实例读取其结果；单实例留空'
+                                                        }
+                                                    }
+                                                ]
+                                            },
+                                            {
+                                                'component': 'VCol',
+                                                'props': {
+                                                    'cols': 12,
+                                                    'md': 3
+                                                },
+                                                'content': [
+                                                    {
+                                                        'component': 'VSwitch',
+                                                        'props': {
+                                                            'model': 'profile',
+                                                            'label': '性能剖析',
+                                                            'hint': '统计每次签到的耗时和内存分配，通过API查看，排查问题时开启'
+                                                        }
+                                                    }
+                                                ]
+                                            },
+                                            {
+                                                'component': 'VCol',
+                                                'props': {
+                                                    'cols': 12,
+                                                    'md': 3
+                                                },
+                                                'content': [
+                                                    {
+                                                        'component': 'VSwitch',
+                                                        'props': {
+                                                            'model': 'record_transcript',
+                                                            'label': '记录请求',
+                                                            'hint': '保存最近10次签到的请求和响应（不含密码和Cookie），可用main.py --replay离线回放'
                                                         }
                                                     }
                                                 ]
@@ -848,15 +1718,117 @@ class JingKeJuSignin(_PluginBase):
         ], {
             "enabled": False,
             "notify": True,
+            "notify_failure_now": False,
             "cron": "30 9 * * *",
+            "schedule_mode": "cron",
+            "adaptive_window": "8-22",
             "onlyonce": False,
             "username": "",
             "password": "",
             "is_email": False,
+            "accounts": "",
+            "max_workers": 3,
+            "prewarm_minutes": 0,
             "history_days": 30,
             "retry_count": 0,
             "retry_interval": 2,
-            "use_proxy": True
+            "cooldown_hours": 6,
+            "use_proxy": True,
+            "proxy_list": "",
+            "proxy_check_interval": 30,
+            "lease_path": "",
+            "profile": False,
+            "record_transcript": False
+        }
+
+    def get_dashboard_meta(self) -> Optional[List[Dict[str, str]]]:
+        """
+        注册仪表盘组件
+        """
+        return [{"key": "summary", "name": "镜客居签到"}]
+
+    def get_dashboard(self, key: str = None, **kwargs) -> Optional[Tuple[Dict[str, Any], Dict[str, Any], List[dict]]]:
+        """
+        仪表盘组件：今日签到情况、连续签到天数、下次签到时间和最近的签到趋势，直接读取签到摘要
+        """
+        summary = self._summary.snapshot() if self._summary else SignSummary().snapshot()
+        today = summary["today"]
+        if today["failed"]:
+            today_text, today_color = f"{today['succeeded']}成功 {today['failed']}失败", "error"
+        elif today["succeeded"]:
+            today_text, today_color = f"{today['succeeded']}个账号已签到", "success"
+        else:
+            today_text, today_color = "尚未签到", "warning"
+
+        tz = pytz.timezone(settings.TZ)
+        now = datetime.now(tz=tz)
+        next_time = self._next_fire_time(now) if self._enabled else None
+        retry_time = self._retry_queue.next_due() if self._retry_queue else None
+        if retry_time and (not next_time or retry_time < next_time):
+            next_text = f"{retry_time.astimezone(tz).strftime('%m-%d %H:%M')} 重试"
+        elif next_time:
+            next_text = next_time.strftime('%m-%d %H:%M')
+        else:
+            next_text = "未启用"
+
+        trend = summary["trend"]
+        last = summary["last"]
+        elements = [
+            {
+                'component': 'VRow',
+                'content': [
+                    self._dashboard_stat('今日状态', today_text, 'mdi-calendar-check', today_color),
+                    self._dashboard_stat('连续签到', f"{summary['streak']}天", 'mdi-fire', 'primary'),
+                    self._dashboard_stat('下次签到', next_text, 'mdi-clock-outline', 'info'),
+                    self._dashboard_stat('最近签到', last["date"][5:16] if last else "暂无记录",
+                                         'mdi-history', 'secondary')
+                ]
+            },
+            {
+                'component': 'div',
+                'props': {'class': 'text-caption text-medium-emphasis mt-2'},
+                'text': f"签到趋势（{trend['account']} {trend['date'][:10]}）：{' '.join(trend['text'].split())}" if trend
+                else "暂无签到趋势"
+            }
+        ]
+        return {"cols": 12, "md": 6}, {"refresh": 60, "border": True, "title": "镜客居签到"}, elements
+
+    @staticmethod
+    def _dashboard_stat(title: str, value: str, icon: str, color: str) -> dict:
+        """
+        仪表盘中的单项统计
+        """
+        return {
+            'component': 'VCol',
+            'props': {'cols': 6, 'md': 3},
+            'content': [
+                {
+                    'component': 'div',
+                    'props': {'class': 'd-flex align-center'},
+                    'content': [
+                        {
+                            'component': 'VIcon',
+                            'props': {'color': color, 'class': 'mr-2'},
+                            'text': icon
+                        },
+                        {
+                            'component': 'div',
+                            'content': [
+                                {
+                                    'component': 'div',
+                                    'props': {'class': 'text-caption'},
+                                    'text': title
+                                },
+                                {
+                                    'component': 'div',
+                                    'props': {'class': 'text-subtitle-1 font-weight-bold'},
+                                    'text': value
+                                }
+                            ]
+                        }
+                    ]
+                }
+            ]
         }
 
     def get_page(self) -> List[dict]:
@@ -980,6 +1952,14 @@ class JingKeJuSignin(_PluginBase):
                         },
                         'text': record.get("date", "")
                     },
+                    # 账号列
+                    {
+                        'component': 'td',
+                        'props': {
+                            'class': 'text-caption'
+                        },
+                        'text': record.get("account", self._username or "")
+                    },
                     # 状态列
                     {
                         'component': 'td',
@@ -1011,7 +1991,7 @@ class JingKeJuSignin(_PluginBase):
                             {
                                 'component': 'div',
                                 'props': {'class': 'mt-1 text-caption grey--text'},
-                                'text': f"将在{record.get('retry', {}).get('interval', self._retry_interval)}小时后重试 ({record.get('retry', {}).get('current', 0)}/{record.get('retry', {}).get('max', self._retry_count)})" if status_color == 'error' and record.get('retry', {}).get('enabled', False) and record.get('retry', {}).get('current', 0) > 0 else ""
+                                'text': f"将于{record['retry']['next']}重试 ({record['retry'].get('current', 0)}/{record['retry'].get('max', self._retry_count)})" if status_color == 'error' and record.get('retry', {}).get('next') else f"将在{record.get('retry', {}).get('interval', self._retry_interval)}小时后重试 ({record.get('retry', {}).get('current', 0)}/{record.get('retry', {}).get('max', self._retry_count)})" if status_color == 'error' and record.get('retry', {}).get('enabled', False) and record.get('retry', {}).get('current', 0) > 0 else ""
                             }
                         ]
                     },
@@ -1081,6 +2061,7 @@ class JingKeJuSignin(_PluginBase):
                                                 'component': 'tr',
                                                 'content': [
                                                     {'component': 'th', 'text': '时间'},
+                                                    {'component': 'th', 'text': '账号'},
                                                     {'component': 'th', 'text': '状态'},
                                                     {'component': 'th', 'text': '签到趋势'}
                                                 ]
@@ -1120,10 +2101,24 @@ class JingKeJuSignin(_PluginBase):
         退出插件
         """
         try:
+            # 写入尚未保存的历史记录
+            self._flush_history()
+        except Exception as e:
+            logger.error(f"保存签到历史记录失败: {str(e)}")
+        try:
+            # 关闭全部会话，包括预热中持有的会话
+            self._warm_sessions = {}
+            if self._client:
+                self._client.close()
             if self._scheduler:
                 self._scheduler.remove_all_jobs()
                 if self._scheduler.running:
                     self._scheduler.shutdown()
                 self._scheduler = None
+            # 写完队列中的事件日志
+            if self._events:
+                self._events.stop()
+            # 下次加载配置时完整初始化
+            self._applied_config = None
         except Exception as e:
             logger.error("退出插件失败：%s" % str(e)) 
@@ -0,0 +1,16 @@
+from .adaptive import HourlyStats, parse_window
+from .client import JingKeJuClient, STATUS_SUCCESS, STATUS_SIGNED, STATUS_FAILED, FAILURE_CAPTCHA, \
+    FAILURE_CREDENTIAL, parse_accounts
+from .cooldown import CooldownTracker
+from .events import EventLogger, format_event
+from .export import csv_lines, filter_history, ndjson_lines, parse_day
+from .lease import LeaseStore
+from .profiling import RunProfiler
+from .proxy import ProxyPool
+from .retry import RetryQueue, day_deadline, forum_day
+from .runner import run_accounts, run_concurrently, sign_with_lease
+from .scanner import TokenScanner
+from .session import SessionPool
+from .summary import SignSummary
+from .transcript import ReplayAdapter, TranscriptRecorder, load_transcript
+from .transport import CachingAdapter, DnsCache, ResumingSSLContext
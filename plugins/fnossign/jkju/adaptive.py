@@ -0,0 +1,91 @@
+import hashlib
+import threading
+from datetime import date, datetime, time as dt_time
+from typing import Any, Dict, Optional, Tuple
+
+
+def parse_window(text: str) -> Tuple[int, int]:
+    """
+    解析签到时间窗口，如 "8-12" 表示8:00到12:59之间
+    """
+    start, _, end = (text or "").partition("-")
+    start_hour, end_hour = int(start), int(end or start)
+    if not (0 <= start_hour <= end_hour <= 23):
+        raise ValueError(f"签到时间窗口格式错误: {text}")
+    return start_hour, end_hour
+
+
+class HourlyStats:
+    """
+    按小时统计签到耗时和失败率，用于自适应选择签到时间
+    """
+
+    # 耗时的指数加权平均系数
+    EWMA_ALPHA = 0.3
+    # 一次失败折算的耗时(秒)：失败后要等待重试，代价远大于多等几秒
+    FAILURE_COST = 30
+    # 每个小时至少签到多少次后才参与比较，之前按时间顺序依次尝试
+    MIN_SAMPLES = 2
+
+    def __init__(self, state: Dict[str, Dict[str, Any]] = None):
+        """
+        :param state: 保存的统计数据，{小时: {"runs", "failures", "latency"}}
+        """
+        self._lock = threading.Lock()
+        self._hours: Dict[int, Dict[str, Any]] = {int(hour): dict(item) for hour, item in (state or {}).items()}
+
+    def record(self, hour: int, elapsed: Optional[float], success: bool):
+        """
+        记录一次签到结果
+        """
+        with self._lock:
+            item = self._hours.setdefault(hour, {"runs": 0, "failures": 0, "latency": None})
+            item["runs"] += 1
+            if not success:
+                item["failures"] += 1
+            if elapsed is not None:
+                latency = item["latency"]
+                item["latency"] = round(elapsed if latency is None
+                                        else self.EWMA_ALPHA * elapsed + (1 - self.EWMA_ALPHA) * latency, 3)
+
+    def cost(self, hour: int) -> Optional[float]:
+        """
+        该小时签到的预期代价：平均耗时 + 失败率 * 失败代价，样本不足时为空
+        """
+        with self._lock:
+            item = self._hours.get(hour)
+            if not item or item["runs"] < self.MIN_SAMPLES:
+                return None
+            # 平滑失败率，避免少量样本时失败率为0或1
+            failure_rate = (item["failures"] + 1) / (item["runs"] + 2)
+            return (item["latency"] or 0) + failure_rate * self.FAILURE_COST
+
+    def best_hour(self, start_hour: int, end_hour: int) -> int:
+        """
+        时间窗口内预期代价最低的小时，有样本不足的小时时先按顺序尝试该小时
+        """
+        costs = {}
+        for hour in range(start_hour, end_hour + 1):
+            cost = self.cost(hour)
+            if cost is None:
+                return hour
+            costs[hour] = cost
+        return min(costs, key=lambda hour: (costs[hour], hour))
+
+    def choose_time(self, day: date, start_hour: int, end_hour: int, tzinfo=None) -> datetime:
+        """
+        选择某天的签到时间：小时取代价最低的小时，分钟由日期确定，同一天的结果固定
+        """
+        hour = self.best_hour(start_hour, end_hour)
+        minute = int(hashlib.sha1(day.isoformat().encode()).hexdigest(), 16) % 60
+        chosen = datetime.combine(day, dt_time(hour, minute))
+        if tzinfo is None:
+            return chosen
+        return tzinfo.localize(chosen) if hasattr(tzinfo, "localize") else chosen.replace(tzinfo=tzinfo)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        导出统计数据，用于持久化
+        """
+        with self._lock:
+            return {str(hour): dict(item) for hour, item in sorted(self._hours.items())}
@@ -0,0 +1,472 @@
+import codecs
+import logging
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+from bs4 import BeautifulSoup
+
+from .events import EventLogger
+from .proxy import ProxyPool
+from .scanner import TokenScanner
+from .session import SessionPool
+
+# 签到结果状态
+STATUS_SUCCESS = "success"  # 签到成功
+STATUS_SIGNED = "signed"  # 今日已签到
+STATUS_FAILED = "failed"  # 签到失败
+
+# 失败类型：重试无法解决，需要人工处理的失败
+FAILURE_CAPTCHA = "captcha"  # 登录需要验证码
+FAILURE_CREDENTIAL = "credential"  # 用户名或密码错误
+# Discuz明确提示密码错误的文字，只有出现这些提示时才判定为账号密码错误
+CREDENTIAL_ERROR_TEXTS = ("您还可以尝试", "密码错误次数过多")
+
+# formhash在同一会话的各个表单中相同，取页面中第一个即可
+FORMHASH_RE = re.compile(r'<input\b(?=[^>]*\bname="formhash")[^>]*\bvalue="([^"]*)"')
+# 登录页令牌：登录表单action中的loginhash、formhash
+LOGIN_TOKENS = {
+    "loginhash": re.compile(r'<form\b(?=[^>]*\bname="login")[^>]*\baction="[^"]*?loginhash=(\w+)(?=["&])'),
+    "formhash": FORMHASH_RE,
+}
+# 签到页令牌：签到按钮文字、formhash
+SIGN_TOKENS = {
+    "sign_button": re.compile(r'<div class="bm signbtn cl">.*?<a\b[^>]*>(.*?)</a>', re.S),
+    "formhash": FORMHASH_RE,
+}
+
+
+class JingKeJuClient:
+    """
+    镜客居签到核心：登录、获取签到页、签到，不依赖MoviePilot
+    """
+
+    # 网站相关常量
+    BASE_URL = "https://www.jkju.cc/"
+    LOGIN_PAGE = "https://www.jkju.cc/member.php"
+    LOGIN_URL = "https://www.jkju.cc/member.php"
+    SIGN_URL = "https://www.jkju.cc/plugin.php"
+    SIGN_PAGE_URL = "https://www.jkju.cc/plugin.php?id=zqlj_sign"
+    USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) " \
+                 "AppleWebKit/537.36 (KHTML, like Gecko) " \
+                 "Chrome/140.0.0.0 Safari/537.36 Edg/140.0.0.0"
+    # 请求超时(连接, 读取)
+    REQUEST_TIMEOUT = (10, 30)
+    # 流式读取的分块大小
+    CHUNK_SIZE = 8192
+    # 预热会话的默认有效期(秒)
+    WARM_TTL = 3600
+
+    def __init__(self, proxy_pool: Optional[ProxyPool] = None, logger=None,
+                 session_pool: Optional[SessionPool] = None, warm_ttl: Optional[float] = None):
+        """
+        :param proxy_pool: 代理池，为空时直连
+        :param logger: 日志对象，为空时使用标准库logging；不是EventLogger时在当前线程直接写入
+        :param session_pool: 会话池，为空时新建
+        :param warm_ttl: 预热会话的有效期(秒)，应不小于预热到签到的间隔，为空时使用WARM_TTL
+        """
+        self.proxy_pool = proxy_pool
+        self.warm_ttl = warm_ttl or self.WARM_TTL
+        self.logger = logger if isinstance(logger, EventLogger) else \
+            EventLogger(logger or logging.getLogger(__name__), queued=False)
+        self.sessions = session_pool or SessionPool()
+        # 各账号最近一次使用的代理
+        self._account_proxies: Dict[str, str] = {}
+
+    def request(self, session: requests.Session, username: str, method: str, url: str,
+                **kwargs) -> requests.Response:
+        """
+        发送请求，按代理池排序依次尝试，连接失败时自动切换到下一个代理
+        """
+        kwargs.setdefault("timeout", self.REQUEST_TIMEOUT)
+        if not self.proxy_pool:
+            return session.request(method, url, **kwargs)
+
+        last_error = None
+        for key in self.proxy_pool.ranked(prefer=self._account_proxies.get(username)):
+            session.proxies = self.proxy_pool.get(key)
+            start = time.monotonic()
+            try:
+                resp = session.request(method, url, **kwargs)
+            except (requests.exceptions.ProxyError,
+                    requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout) as e:
+                self.logger.event("proxy_switch", "代理请求失败，切换代理", logging.WARNING, account=username,
+                                  proxy=ProxyPool.mask(key), error=type(e).__name__)
+                self.proxy_pool.report(key, False)
+                last_error = e
+                continue
+            self.proxy_pool.report(key, True, time.monotonic() - start)
+            self._account_proxies[username] = key
+            return resp
+        raise last_error
+
+    def fetch_page(self, session: requests.Session, username: str, url: str,
+                   scanner: TokenScanner = None, until: Callable[[Dict[str, str]], bool] = None,
+                   keep_body: bool = True, **kwargs) -> str:
+        """
+        流式获取页面，边读取边扫描令牌
+        不使用条件请求：签到状态和formhash随登录状态和日期变化，Discuz页面的缓存校验信息不能反映这些变化
+        :param scanner: 令牌扫描器，边读取边扫描
+        :param until: 提前结束条件，已找到的令牌满足条件时停止读取并关闭连接，默认找到全部令牌即停止
+        :param keep_body: 是否保留页面内容，只需要令牌时不保留
+        """
+        if scanner and until is None:
+            until = lambda tokens: scanner.done
+
+        resp = self.request(session, username, "GET", url, stream=True, **kwargs)
+        if resp.status_code == 403:
+            resp.close()
+            resp = self.request(session, username, "GET", url, stream=True, **kwargs)
+        try:
+            decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+            chunks = []
+            complete = True
+            for chunk in resp.iter_content(chunk_size=self.CHUNK_SIZE):
+                text = decoder.decode(chunk)
+                if keep_body:
+                    chunks.append(text)
+                if scanner and until(scanner.feed(text)):
+                    complete = False
+                    break
+            if complete and keep_body:
+                chunks.append(decoder.decode(b"", final=True))
+            return "".join(chunks)
+        finally:
+            resp.close()
+
+    @staticmethod
+    def _sign_page_ready(tokens: Dict[str, str]) -> bool:
+        """
+        签到页已读取到签到按钮和formhash且尚未签到时，无需继续读取
+        已签到时需要读取后面的签到趋势
+        """
+        button = tokens.get("sign_button")
+        return button is not None and "今日已打卡" not in button and "formhash" in tokens
+
+    def _result(self, username: str, status: str, message: str, trend: str = "",
+                start: float = None, failure: str = None) -> Dict[str, Any]:
+        """
+        组装签到结果
+        :param failure: 失败类型，验证码、账号密码错误等重试无法解决的失败，其他失败为空
+        """
+        proxy = self._account_proxies.get(username) if self.proxy_pool else None
+        return {
+            "username": username,
+            "status": status,
+            "message": message,
+            "trend": trend,
+            "proxy": ProxyPool.mask(proxy) if proxy else None,
+            "elapsed": round(time.monotonic() - start, 3) if start is not None else None,
+            "failure": failure
+        }
+
+    def sign(self, account: Dict[str, Any], warm: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        单个账号签到
+        :param account: {"username": 账号, "password": 密码, "is_email": 是否邮箱登录}
+        :param warm: prepare()预热好的会话，有效时只需发送签到请求
+        :return: 签到结果，status为success/signed/failed，message为结果说明或失败原因
+        """
+        username = account["username"]
+        start = time.monotonic()
+        if warm:
+            if time.monotonic() - warm["prepared_at"] <= self.warm_ttl:
+                result = self._submit_sign(warm, start)
+                self._finish(warm, result)
+                if result["status"] != STATUS_FAILED:
+                    result["prewarmed"] = True
+                    return result
+                # 预热的会话可能已失效，重新走完整流程
+                self.logger.event("warm_fallback", "预热会话签到失败，重新登录签到", logging.WARNING, account=username)
+            else:
+                self.release(warm)
+
+        self._account_proxies.pop(username, None)
+        prepared = None
+        try:
+            prepared, failure = self.prepare(account, start=start)
+            if failure:
+                return failure
+            result = self._submit_sign(prepared, start)
+        except Exception as e:
+            self.logger.event("sign_error", "签到过程发生未知错误", logging.ERROR, account=username, error=str(e))
+            result = self._result(username, STATUS_FAILED, f"签到过程发生未知错误: {str(e)}", start=start)
+        if prepared:
+            self._finish(prepared, result)
+        return result
+
+    def prepare(self, account: Dict[str, Any],
+                start: float = None) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        登录并获取签到页，得到可直接发送签到请求的会话
+        会话从会话池借出，失败时关闭，成功时由调用方通过sign()或release()归还
+        :return: (预热会话, None) 或 (None, 失败的签到结果)
+        """
+        username = account["username"]
+        if start is None:
+            start = time.monotonic()
+        session = self.sessions.acquire(username)
+        try:
+            warm, failure = self._prepare(session, account, start)
+        except Exception:
+            self.sessions.discard(session)
+            raise
+        if failure:
+            self.sessions.discard(session)
+        return warm, failure
+
+    def release(self, warm: Dict[str, Any]):
+        """
+        归还未使用的预热会话
+        """
+        self.sessions.release(warm["username"], warm["session"])
+
+    def _finish(self, warm: Dict[str, Any], result: Dict[str, Any]):
+        """
+        签到结束：成功时归还会话保留登录状态，失败时关闭会话
+        """
+        if result["status"] == STATUS_FAILED:
+            self.sessions.discard(warm["session"])
+        else:
+            self.release(warm)
+
+    def close(self):
+        """
+        关闭全部会话
+        """
+        self.sessions.close()
+
+    def _prepare(self, session: requests.Session, account: Dict[str, Any],
+                 start: float) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        username = account["username"]
+
+        # 复用的会话先检查登录状态，签到页能找到签到按钮说明仍在登录中
+        if session.cookies:
+            try:
+                sign_scanner = TokenScanner(SIGN_TOKENS)
+                sign_page_html = self.fetch_page(session, username, self.SIGN_PAGE_URL, scanner=sign_scanner,
+                                                 until=self._sign_page_ready)
+                if "sign_button" in sign_scanner.tokens:
+                    self.logger.event("session_valid", "登录状态有效", account=username)
+                    return self._warm(username, session, sign_scanner.tokens, sign_page_html), None
+            except Exception as e:
+                self.logger.event("session_check_error", "检查登录状态出错，重新登录", logging.WARNING,
+                                  account=username, error=str(e))
+            session.cookies.clear()
+
+        # 登录表单数据
+        login_form_data = {
+            "referer": self.BASE_URL,
+            "questionid": 0,
+            "answer": "",
+            "cookietime": "2592000",
+            "username": username,
+            "password": account["password"],
+            "loginfield": "email" if account.get("is_email") else "username"
+        }
+
+        login_headers = {
+            "User-Agent": self.USER_AGENT,
+            "Origin": "https://www.jkju.cc",
+            "Referer": "https://www.jkju.cc/member.php?mod=logging&action=login",
+        }
+
+        # 登录参数
+        login_params = {
+            "mod": "logging",
+            "action": "login",
+            "loginsubmit": "yes",
+            "inajax": 1,
+        }
+
+        # 获取登录哈希
+        try:
+            # 只需要页面顶部的令牌，找到后即停止读取
+            scanner = TokenScanner(LOGIN_TOKENS)
+            self.fetch_page(
+                session, username,
+                self.LOGIN_PAGE,
+                scanner=scanner,
+                keep_body=False,
+                params={"mod": "logging", "action": "login"}
+            )
+            if not scanner.done:
+                self.logger.event("login_form_missing", "无法找到登录表单", logging.ERROR, account=username)
+                return None, self._result(username, STATUS_FAILED, "无法找到登录表单", start=start)
+
+            login_form_data["formhash"] = scanner.tokens["formhash"]
+            login_params["loginhash"] = scanner.tokens["loginhash"]
+
+        except Exception as e:
+            self.logger.event("login_hash_error", "获取登录哈希失败", logging.ERROR, account=username, error=str(e))
+            return None, self._result(username, STATUS_FAILED, f"获取登录信息失败: {str(e)}", start=start)
+
+        # 执行登录
+        try:
+            resp = self.request(
+                session, username, "POST",
+                self.LOGIN_URL,
+                params=login_params,
+                data=login_form_data,
+                headers=login_headers,
+            )
+
+            if resp.status_code == 403:
+                session.cookies.clear_expired_cookies()
+                resp = self.request(
+                    session, username, "POST",
+                    self.LOGIN_URL,
+                    params=login_params,
+                    data=login_form_data,
+                    headers=login_headers,
+                )
+
+            text = resp.text
+            if "请输入验证码继续登录" in text:
+                self.logger.event("login_captcha", "登录需要验证码", logging.ERROR, account=username)
+                return None, self._result(username, STATUS_FAILED, "登录需要验证码，请手动登录一次", start=start,
+                                          failure=FAILURE_CAPTCHA)
+            if "欢迎您回来" not in text:
+                # 403、5xx、防火墙验证页等可能是临时拦截，不判定为账号密码错误，按普通失败重试
+                if resp.status_code == 200 and any(hint in text for hint in CREDENTIAL_ERROR_TEXTS):
+                    self.logger.event("login_failed", "登录失败，账号或密码错误", logging.ERROR, account=username)
+                    return None, self._result(username, STATUS_FAILED, "登录失败，用户名或密码不正确", start=start,
+                                              failure=FAILURE_CREDENTIAL)
+                self.logger.event("login_failed", "登录失败，未找到欢迎信息", logging.ERROR, account=username,
+                                  status=resp.status_code)
+                return None, self._result(username, STATUS_FAILED, f"登录失败，未找到欢迎信息（HTTP {resp.status_code}）",
+                                          start=start)
+
+            self.logger.event("login_ok", "登录成功", account=username)
+
+        except Exception as e:
+            self.logger.event("login_error", "登录过程出错", logging.ERROR, account=username, error=str(e))
+            return None, self._result(username, STATUS_FAILED, f"登录过程出错: {str(e)}", start=start)
+
+        # 获取签到页面
+        try:
+            sign_scanner = TokenScanner(SIGN_TOKENS)
+            sign_page_html = self.fetch_page(session, username, self.SIGN_PAGE_URL, scanner=sign_scanner,
+                                             until=self._sign_page_ready)
+            if not sign_page_html:
+                self.logger.event("sign_page_missing", "获取签到页面失败", logging.ERROR, account=username)
+                return None, self._result(username, STATUS_FAILED, "获取签到页面失败", start=start)
+        except Exception as e:
+            self.logger.event("sign_page_error", "获取签到页面出错", logging.ERROR, account=username, error=str(e))
+            return None, self._result(username, STATUS_FAILED, f"获取签到页面出错: {str(e)}", start=start)
+
+        # 检查是否已签到
+        try:
+            return self._warm(username, session, sign_scanner.tokens, sign_page_html), None
+        except Exception as e:
+            self.logger.event("sign_status_error", "检查签到状态出错", logging.ERROR, account=username, error=str(e))
+            return None, self._result(username, STATUS_FAILED, f"检查签到状态出错: {str(e)}", start=start)
+
+    def _warm(self, username: str, session: requests.Session, tokens: Dict[str, str],
+              sign_page_html: str) -> Dict[str, Any]:
+        """
+        根据签到页令牌组装预热会话
+        """
+        sign_status_text = tokens.get("sign_button")
+        if sign_status_text is None:
+            raise ValueError("未找到签到按钮")
+        signed = "今日已打卡" in sign_status_text
+        return {
+            "username": username,
+            "session": session,
+            "sign_hash": tokens.get("formhash"),
+            "signed": signed,
+            # 已签到时签到页已完整读取，直接获取签到趋势
+            "trend": self.get_sign_trend(sign_page_html) if signed else "",
+            "prepared_at": time.monotonic()
+        }
+
+    def _submit_sign(self, warm: Dict[str, Any], start: float) -> Dict[str, Any]:
+        """
+        使用预热会话发送签到请求
+        """
+        username = warm["username"]
+        session = warm["session"]
+        if warm["signed"]:
+            self.logger.event("already_signed", "今日已签到", account=username)
+            return self._result(username, STATUS_SIGNED, "今日已签到", warm["trend"], start=start)
+
+        # 执行签到
+        try:
+            # 获取签到哈希
+            sign_hash = warm["sign_hash"]
+            if not sign_hash:
+                raise ValueError("未找到formhash")
+
+            # 发送签到请求
+            sign_headers = {
+                "User-Agent": self.USER_AGENT,
+                "Referer": self.BASE_URL,
+            }
+
+            resp = self.request(
+                session, username, "GET",
+                self.SIGN_URL,
+                headers=sign_headers,
+                params={"id": "zqlj_sign", "sign": sign_hash},
+            ).text
+
+            # 检查签到结果
+            if "恭喜您，打卡成功！" in resp:
+                self.logger.event("signed", "签到成功", account=username)
+                # 重新获取签到页面以获取最新趋势
+                sign_page_html = self.fetch_page(session, username, self.SIGN_PAGE_URL)
+                trend_text = self.get_sign_trend(sign_page_html)
+                return self._result(username, STATUS_SUCCESS, "签到成功", trend_text, start=start)
+            elif "您今天已经打过卡了，请勿重复操作！" in resp:
+                self.logger.event("already_signed", "今日已签到", account=username)
+                sign_page_html = self.fetch_page(session, username, self.SIGN_PAGE_URL)
+                trend_text = self.get_sign_trend(sign_page_html)
+                return self._result(username, STATUS_SIGNED, "今日已签到", trend_text, start=start)
+            else:
+                self.logger.event("sign_failed", "签到失败，响应内容无法识别", logging.ERROR, account=username,
+                                  response=resp)
+                return self._result(username, STATUS_FAILED, "签到失败，未知错误", start=start)
+
+        except Exception as e:
+            self.logger.event("sign_request_error", "执行签到出错", logging.ERROR, account=username, error=str(e))
+            return self._result(username, STATUS_FAILED, f"执行签到出错: {str(e)}", start=start)
+
+    def get_sign_trend(self, html: str) -> str:
+        """获取签到趋势信息"""
+        try:
+            soup = BeautifulSoup(html, "lxml")
+            trend_lis = soup.select('#wp > div.ct2.cl > div.sd > div:nth-of-type(3) > div.bm_c > ul > li')
+            if trend_lis:
+                return "\n".join(li.text.strip() for li in trend_lis[:5])  # 只取前5条
+            return "无法获取签到趋势"
+        except Exception as e:
+            self.logger.event("trend_error", "获取签到趋势出错", logging.ERROR, error=str(e))
+            return "获取签到趋势失败"
+
+
+def parse_accounts(text: str) -> List[Dict[str, Any]]:
+    """
+    解析账号列表，每行一个，格式：账号#密码，邮箱登录时追加 #email
+    """
+    accounts = []
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if not line or "#" not in line:
+            continue
+        parts = line.split("#")
+        is_email = False
+        if len(parts) > 2 and parts[-1].strip().lower() in ("email", "username"):
+            is_email = parts.pop().strip().lower() == "email"
+        username = parts[0].strip()
+        password = "#".join(parts[1:])
+        if not username or not password:
+            continue
+        accounts.append({
+            "username": username,
+            "password": password,
+            "is_email": is_email
+        })
+    return accounts
@@ -0,0 +1,89 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .client import FAILURE_CAPTCHA, FAILURE_CREDENTIAL
+
+
+class CooldownTracker:
+    """
+    账号冷却：验证码、账号密码错误等重试无法解决的失败，在冷却期内不再发起任何请求
+    同一类失败连续出现时冷却时间翻倍，签到成功或人工解除后清除
+    """
+
+    # 各失败类型的冷却时间倍数，账号密码错误不会自行恢复，冷却更久
+    FAILURE_FACTORS = {
+        FAILURE_CAPTCHA: 1,
+        FAILURE_CREDENTIAL: 4,
+    }
+    # 最长冷却时间(小时)
+    MAX_HOURS = 7 * 24
+
+    def __init__(self, hours: float = 6, state: Dict[str, Dict[str, Any]] = None):
+        """
+        :param hours: 基础冷却时间(小时)，0表示不冷却
+        :param state: 保存的冷却状态，{账号: 冷却信息}
+        """
+        self.hours = hours
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, Any]] = dict(state or {})
+
+    @property
+    def enabled(self) -> bool:
+        return self.hours > 0
+
+    def record(self, username: str, failure: str, reason: str, now: float = None) -> Optional[Dict[str, Any]]:
+        """
+        记录一次需要冷却的失败
+        :return: 冷却信息，未启用冷却时为空
+        """
+        if not self.enabled:
+            return None
+        now = now if now is not None else time.time()
+        with self._lock:
+            previous = self._state.get(username)
+            count = previous["count"] + 1 if previous and previous["failure"] == failure else 1
+            hours = min(self.hours * self.FAILURE_FACTORS.get(failure, 1) * 2 ** (count - 1), self.MAX_HOURS)
+            entry = {
+                "failure": failure,
+                "reason": reason,
+                "count": count,
+                "since": now,
+                "until": now + hours * 3600
+            }
+            self._state[username] = entry
+            return dict(entry)
+
+    def active(self, username: str, now: float = None) -> Optional[Dict[str, Any]]:
+        """
+        账号冷却中时返回冷却信息，未启用冷却时已有的冷却不再生效
+        """
+        if not self.enabled:
+            return None
+        now = now if now is not None else time.time()
+        with self._lock:
+            entry = self._state.get(username)
+            if entry and entry["until"] > now:
+                return dict(entry)
+        return None
+
+    def clear(self, username: str = None) -> List[str]:
+        """
+        解除冷却
+        :param username: 指定账号，不指定则解除全部账号
+        :return: 解除冷却的账号
+        """
+        with self._lock:
+            if username is None:
+                cleared = list(self._state)
+                self._state.clear()
+            else:
+                cleared = [username] if self._state.pop(username, None) else []
+        return cleared
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        导出冷却状态，用于持久化
+        """
+        with self._lock:
+            return {username: dict(entry) for username, entry in self._state.items()}
@@ -0,0 +1,190 @@
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional, Tuple
+
+# 字段值最长保留的字符数，避免异常信息、响应内容刷屏
+MAX_FIELD_LENGTH = 200
+
+
+def format_event(record: logging.LogRecord) -> str:
+    """
+    格式化结构化事件：[账号] 消息 | event=事件类型 run=运行编号 字段=值
+    """
+    account = getattr(record, "account", None)
+    message = record.getMessage()
+    text = f"[{account}] {message}" if account else message
+    fields: List[Tuple[str, Any]] = [("event", getattr(record, "event", None)), ("run", getattr(record, "run", None))]
+    fields.extend((getattr(record, "fields", None) or {}).items())
+    pairs = []
+    for key, value in fields:
+        if value is None:
+            continue
+        value = " ".join(str(value).split())
+        if len(value) > MAX_FIELD_LENGTH:
+            value = value[:MAX_FIELD_LENGTH] + "..."
+        pairs.append(f"{key}={value}")
+    return f"{text} | {' '.join(pairs)}" if pairs else text
+
+
+class _TargetHandler(logging.Handler):
+    """
+    把事件转发给实际的日志对象，MoviePilot的logger和标准库logger都只需要info/warning等方法
+    """
+
+    def __init__(self, target):
+        super().__init__()
+        self.target = target
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            log = getattr(self.target, record.levelname.lower(), None) or self.target.info
+            log(format_event(record))
+        except Exception:
+            self.handleError(record)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """
+    队列已满时丢弃事件并计数，不阻塞写日志的线程
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class EventLogger:
+    """
+    结构化事件日志：每条日志带事件类型、账号和运行编号，按事件类型限流
+    队列模式下签到线程只把事件放入队列，由后台线程格式化并写入实际的日志，写日志不会拖慢签到
+    同时提供info/warning/error/debug方法，可直接替代原来的logger使用
+    """
+
+    # 各事件类型的限流：(时间窗口内最多输出条数, 时间窗口秒数)，超出的在下一个窗口汇总条数
+    DEFAULT_LIMITS: Dict[str, Tuple[int, float]] = {
+        "proxy_switch": (5, 60),
+        "session_check_error": (5, 60),
+        "cooldown_skip": (10, 3600),
+        "lease_error": (5, 60),
+    }
+
+    def __init__(self, target=None, limits: Dict[str, Tuple[int, float]] = None, queued: bool = True,
+                 queue_size: int = 10000, level: int = logging.INFO):
+        """
+        :param target: 实际的日志对象，为空时使用标准库logging
+        :param limits: 各事件类型的限流，覆盖默认设置
+        :param queued: 是否通过队列在后台线程写日志，否则在当前线程直接写入
+        :param queue_size: 队列长度，队列满时丢弃事件
+        :param level: 最低输出级别
+        """
+        self.target = target or logging.getLogger(__name__)
+        self.limits = {**self.DEFAULT_LIMITS, **(limits or {})}
+        # 当前签到的运行编号，同一时间只有一轮签到
+        self.run_id: Optional[str] = None
+        self._lock = threading.Lock()
+        # 限流窗口：{事件类型: [窗口开始时间, 已输出条数, 已省略条数]}
+        self._windows: Dict[str, List[float]] = {}
+        self._target_handler = _TargetHandler(self.target)
+        self._queue_handler = _DroppingQueueHandler(queue.Queue(queue_size)) if queued else None
+        self._listener: Optional[QueueListener] = None
+        # 独立的logger，不注册到logging全局，也不向上传递
+        self._logger = logging.Logger(f"{__name__}.{id(self)}", level)
+        self._logger.propagate = False
+        self._logger.addHandler(self._queue_handler or self._target_handler)
+
+    @property
+    def dropped(self) -> int:
+        """
+        队列已满时丢弃的事件数
+        """
+        return self._queue_handler.dropped if self._queue_handler else 0
+
+    def start(self):
+        """
+        启动后台写日志线程
+        """
+        if self._queue_handler and not self._listener:
+            self._listener = QueueListener(self._queue_handler.queue, self._target_handler)
+            self._listener.start()
+
+    def stop(self):
+        """
+        写完队列中的事件后停止后台线程
+        """
+        if self._listener:
+            self._listener.stop()
+            self._listener = None
+
+    def event(self, name: str, message: str, level: int = logging.INFO, account: str = None, **fields):
+        """
+        记录一条结构化事件
+        :param name: 事件类型，用于限流和检索
+        :param message: 给人看的说明
+        :param account: 相关账号
+        :param fields: 其他字段，输出为 键=值
+        """
+        if not self._logger.isEnabledFor(level):
+            return
+        allowed, suppressed = self._allow(name)
+        if not allowed:
+            return
+        if suppressed:
+            fields["suppressed"] = suppressed
+        self._emit(level, message, name, account, fields)
+
+    def _allow(self, name: str) -> Tuple[bool, int]:
+        # 固定窗口限流，返回是否输出以及上一个窗口省略的条数
+        limit = self.limits.get(name)
+        if not limit:
+            return True, 0
+        max_count, seconds = limit
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(name)
+            if not window or now - window[0] >= seconds:
+                self._windows[name] = [now, 1, 0]
+                return True, int(window[2]) if window else 0
+            if window[1] < max_count:
+                window[1] += 1
+                return True, 0
+            window[2] += 1
+            return False, 0
+
+    def _emit(self, level: int, message: str, name: Optional[str], account: Optional[str], fields: Dict[str, Any]):
+        # 监听线程未启动时直接写入，避免事件积压在队列中
+        if self._queue_handler and not self._listener:
+            handler = self._target_handler
+        else:
+            handler = None
+        record = self._logger.makeRecord(self._logger.name, level, __file__, 0, message, None, None,
+                                         extra={"event": name, "account": account, "run": self.run_id,
+                                                "fields": fields})
+        if handler:
+            handler.handle(record)
+        else:
+            self._logger.handle(record)
+
+    def debug(self, message: str):
+        self._log(logging.DEBUG, message)
+
+    def info(self, message: str):
+        self._log(logging.INFO, message)
+
+    def warning(self, message: str):
+        self._log(logging.WARNING, message)
+
+    def error(self, message: str):
+        self._log(logging.ERROR, message)
+
+    def _log(self, level: int, message: str):
+        if self._logger.isEnabledFor(level):
+            self._emit(level, message, None, None, {})
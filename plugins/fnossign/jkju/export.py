@@ -0,0 +1,62 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+# CSV导出的列
+CSV_FIELDS = ("date", "account", "status", "trend", "proxy", "retry")
+
+
+def parse_day(text: Optional[str]) -> Optional[str]:
+    """
+    校验日期参数，格式为 YYYY-MM-DD，为空时不限制
+    """
+    if not text:
+        return None
+    return datetime.strptime(text, '%Y-%m-%d').strftime('%Y-%m-%d')
+
+
+def filter_history(records: Iterable[Dict[str, Any]], start: str = None, end: str = None,
+                   account: str = None, default_account: str = None) -> Iterator[Dict[str, Any]]:
+    """
+    按日期范围（含首尾两天）和账号逐条筛选历史记录
+    :param default_account: 旧版本记录没有账号字段时使用的账号
+    """
+    for record in records:
+        day = record.get("date", "")[:10]
+        if start and day < start or end and day > end:
+            continue
+        if account and record.get("account", default_account) != account:
+            continue
+        yield record
+
+
+def ndjson_lines(records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """
+    逐条输出NDJSON，每行一条记录
+    """
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def csv_lines(records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """
+    逐条输出CSV，重试信息以JSON写入一列
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writerow(CSV_FIELDS)
+    yield flush()
+    for record in records:
+        retry = record.get("retry")
+        writer.writerow([json.dumps(retry, ensure_ascii=False) if field == "retry" and retry is not None
+                         else record.get(field, "") for field in CSV_FIELDS])
+        yield flush()
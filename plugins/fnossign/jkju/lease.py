@@ -0,0 +1,119 @@
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from typing import Any, Dict, Optional, Tuple
+
+from .client import STATUS_FAILED
+
+# 租约状态：签到进行中
+LEASE_RUNNING = "running"
+
+
+class LeaseStore:
+    """
+    多实例签到租约：多个实例共用同一个SQLite数据库文件，每个账号每天只有一个实例执行签到
+    其他实例等待持有者完成后直接读取其签到结果；持有者异常退出时租约到期后可被接管，签到失败时也可由其他实例重新签到
+    """
+
+    def __init__(self, path: str, ttl: float = 300, owner: str = None):
+        """
+        :param path: 数据库文件路径，需放在各实例都能访问的目录
+        :param ttl: 租约有效期(秒)，持有者超过该时间未完成视为已退出
+        :param owner: 实例标识，默认为 主机名:进程号:随机串
+        """
+        self.path = path
+        self.ttl = ttl
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                "account TEXT NOT NULL, day TEXT NOT NULL, owner TEXT NOT NULL, status TEXT NOT NULL, "
+                "expires REAL NOT NULL, result TEXT, updated REAL NOT NULL, PRIMARY KEY (account, day))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # 每次操作单独连接，可在多个线程中使用
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def acquire(self, account: str, day: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        获取账号当天的租约
+        :return: (是否获得租约, 当前租约记录)
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT * FROM leases WHERE account = ? AND day = ?", (account, day)).fetchone()
+                lease = self._to_dict(row)
+                # 已有实例签到成功，或其他实例正在签到且租约未到期
+                if lease and (lease["result"] and lease["status"] != STATUS_FAILED
+                              or lease["status"] == LEASE_RUNNING and lease["expires"] > now
+                              and lease["owner"] != self.owner):
+                    conn.execute("COMMIT")
+                    return False, lease
+                conn.execute(
+                    "INSERT OR REPLACE INTO leases (account, day, owner, status, expires, result, updated) "
+                    "VALUES (?, ?, ?, ?, ?, NULL, ?)",
+                    (account, day, self.owner, LEASE_RUNNING, now + self.ttl, now)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return True, None
+
+    def complete(self, account: str, day: str, result: Dict[str, Any]):
+        """
+        保存签到结果并释放租约
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE leases SET status = ?, result = ?, expires = ?, updated = ? "
+                "WHERE account = ? AND day = ? AND owner = ?",
+                (result["status"], json.dumps(result, ensure_ascii=False), now, now, account, day, self.owner)
+            )
+
+    def get(self, account: str, day: str) -> Optional[Dict[str, Any]]:
+        """
+        读取账号当天的租约记录
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM leases WHERE account = ? AND day = ?", (account, day)).fetchone()
+        return self._to_dict(row)
+
+    def wait(self, account: str, day: str, timeout: float, interval: float = 2) -> Optional[Dict[str, Any]]:
+        """
+        等待其他实例完成签到
+        :return: 最新的租约记录
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            lease = self.get(account, day)
+            if not lease or lease["status"] != LEASE_RUNNING or time.monotonic() >= deadline:
+                return lease
+            time.sleep(interval)
+
+    def prune(self, keep_days: int = 7):
+        """
+        清理过期的租约记录
+        """
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM leases WHERE updated < ?", (time.time() - keep_days * 24 * 3600,))
+
+    @staticmethod
+    def _to_dict(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        lease = dict(row)
+        lease["result"] = json.loads(lease["result"]) if lease["result"] else None
+        return lease
@@ -0,0 +1,175 @@
+import cProfile
+import itertools
+import os
+import pstats
+import re
+import sysconfig
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+
+# 内置函数名中的模块，如 <method 'recv_into' of '_ssl._SSLSocket' objects>
+BUILTIN_MODULE_RE = re.compile(r"of '([\w]+)\.")
+STDLIB_PATH = os.path.normcase(sysconfig.get_paths()["stdlib"])
+
+
+def module_of(filename: str, funcname: str) -> str:
+    """
+    函数所属的模块或第三方包，用于按模块汇总耗时，如 bs4、lxml、requests、ssl、jkju
+    """
+    if filename == "~":
+        match = BUILTIN_MODULE_RE.search(funcname)
+        return match.group(1).lstrip("_") if match else "builtins"
+    if filename.startswith("<frozen "):
+        return filename[len("<frozen "):-1].lstrip("_")
+    path = os.path.normcase(filename)
+    parts = re.split(r"[\\/]", path)
+    for marker in ("site-packages", "dist-packages"):
+        if marker in parts:
+            name = parts[parts.index(marker) + 1]
+            return os.path.splitext(name)[0]
+    if "jkju" in parts:
+        return "jkju"
+    if path.startswith(STDLIB_PATH):
+        name = re.split(r"[\\/]", path[len(STDLIB_PATH):].lstrip("\\/"))[0]
+        return os.path.splitext(name)[0]
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.basename(os.path.dirname(path)) if name == "__init__" else name
+
+
+class RunProfiler:
+    """
+    按次剖析签到：cProfile统计耗时最多的函数并按模块汇总，tracemalloc统计内存分配最多的位置
+    只保留最近若干次的结果，同一时间只剖析一次签到
+    """
+
+    def __init__(self, top_n: int = 20, keep: int = 10):
+        """
+        :param top_n: 每次保留耗时最多的函数数、分配内存最多的位置数
+        :param keep: 保留最近多少次剖析结果
+        """
+        self.top_n = top_n
+        self._profiles = deque(maxlen=keep)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # 当前剖析中工作线程的cProfile结果
+        self._thread_profiles: Optional[List[cProfile.Profile]] = None
+        # 执行剖析的线程，该线程已由主剖析器统计
+        self._session_thread: Optional[int] = None
+
+    @contextmanager
+    def session(self, label: str):
+        """
+        剖析一次签到，已有剖析进行中时不剖析
+        """
+        with self._lock:
+            if self._thread_profiles is not None:
+                active = False
+            else:
+                active = True
+                self._thread_profiles = []
+                self._session_thread = threading.get_ident()
+        if not active:
+            yield
+            return
+
+        started = datetime.now()
+        start = time.perf_counter()
+        own_tracing = not tracemalloc.is_tracing()
+        if own_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - start
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if own_tracing:
+                tracemalloc.stop()
+            with self._lock:
+                thread_profiles, self._thread_profiles = self._thread_profiles, None
+            stats = pstats.Stats(profile)
+            for thread_profile in thread_profiles:
+                stats.add(thread_profile)
+            self._profiles.appendleft({
+                "id": next(self._ids),
+                "label": label,
+                "started": started.strftime('%Y-%m-%d %H:%M:%S'),
+                "elapsed": round(elapsed, 3),
+                "peak_kb": round(peak / 1024, 1),
+                "modules": self._module_times(stats),
+                "functions": self._top_functions(stats),
+                "allocations": self._top_allocations(snapshot)
+            })
+
+    def wrap(self, func: Callable) -> Callable:
+        """
+        包装在工作线程中执行的函数，剖析进行中时一并统计该线程
+        """
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self._lock:
+                thread_profiles = self._thread_profiles
+            if thread_profiles is None or threading.get_ident() == self._session_thread:
+                return func(*args, **kwargs)
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Python 3.12起cProfile同时统计所有线程，不能再启用第二个
+                return func(*args, **kwargs)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.disable()
+                with self._lock:
+                    thread_profiles.append(profile)
+        return wrapper
+
+    def _top_functions(self, stats: pstats.Stats) -> List[Dict[str, Any]]:
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:self.top_n]
+        return [{
+            "function": f"{module_of(filename, funcname)}:{os.path.basename(filename)}:{lineno}({funcname})",
+            "calls": nc,
+            "tottime": round(tt, 4),
+            "cumtime": round(ct, 4)
+        } for (filename, lineno, funcname), (_, nc, tt, ct, _) in rows]
+
+    @staticmethod
+    def _module_times(stats: pstats.Stats) -> Dict[str, float]:
+        # 按模块汇总函数自身耗时，可以看出时间花在解析、网络还是调度上
+        totals: Dict[str, float] = {}
+        for (filename, _, funcname), (_, _, tt, _, _) in stats.stats.items():
+            module = module_of(filename, funcname)
+            totals[module] = totals.get(module, 0) + tt
+        return {module: round(total, 4)
+                for module, total in sorted(totals.items(), key=lambda item: item[1], reverse=True)}
+
+    def _top_allocations(self, snapshot: tracemalloc.Snapshot) -> List[Dict[str, Any]]:
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        return [{
+            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_kb": round(stat.size / 1024, 1),
+            "count": stat.count
+        } for stat in snapshot.statistics("lineno")[:self.top_n]]
+
+    def profiles(self) -> List[Dict[str, Any]]:
+        """
+        最近的剖析结果，最新的在前
+        """
+        return list(self._profiles)
+
+    def clear(self):
+        self._profiles.clear()
@@ -0,0 +1,136 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+
+
+class ProxyPool:
+    """
+    代理池：后台健康检查，按延迟和成功率排序，请求失败时自动切换
+    """
+
+    # 延迟的指数平滑系数
+    EWMA_ALPHA = 0.3
+
+    def __init__(self, proxies: List[Union[str, Dict[str, str]]], check_url: str, timeout: float = 10):
+        """
+        :param proxies: 代理列表，可以是代理地址，也可以是requests格式的代理字典
+        :param check_url: 健康检查地址
+        :param timeout: 健康检查超时时间(秒)
+        """
+        self._check_url = check_url
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._proxies: Dict[str, Dict[str, str]] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        for proxy in proxies:
+            if not proxy:
+                continue
+            if isinstance(proxy, str):
+                proxy = {"http": proxy.strip(), "https": proxy.strip()}
+            key = proxy.get("https") or proxy.get("http")
+            if not key or key in self._proxies:
+                continue
+            self._proxies[key] = proxy
+            self._stats[key] = {
+                "latency": None,
+                "success": 0,
+                "failure": 0,
+                "alive": True,
+                "checked_at": None
+            }
+
+    def __len__(self):
+        return len(self._proxies)
+
+    @staticmethod
+    def mask(key: Optional[str]) -> str:
+        """
+        隐藏代理地址中的账号密码
+        """
+        if not key:
+            return ""
+        parts = urlsplit(key)
+        if "@" not in parts.netloc:
+            return key
+        netloc = "***@" + parts.netloc.rsplit("@", 1)[-1]
+        return urlunsplit((parts.scheme, netloc, parts.path, parts.query, parts.fragment))
+
+    def get(self, key: str) -> Dict[str, str]:
+        """
+        获取requests格式的代理字典
+        """
+        return self._proxies[key]
+
+    def _score(self, key: str) -> float:
+        """
+        代理评分，越小越好：平滑延迟 / 平滑成功率
+        """
+        stat = self._stats[key]
+        latency = stat["latency"] if stat["latency"] is not None else self._timeout
+        success_rate = (stat["success"] + 1) / (stat["success"] + stat["failure"] + 2)
+        return latency / success_rate
+
+    def ranked(self, prefer: Optional[str] = None) -> List[str]:
+        """
+        按可用性和评分排序的代理列表，不可用的代理排在最后作为兜底
+        :param prefer: 优先使用的代理（当前会话正在使用的代理）
+        """
+        with self._lock:
+            keys = sorted(self._proxies, key=lambda k: (not self._stats[k]["alive"], self._score(k)))
+        if prefer in keys and self._stats[prefer]["alive"]:
+            keys.remove(prefer)
+            keys.insert(0, prefer)
+        return keys
+
+    def report(self, key: str, ok: bool, latency: Optional[float] = None):
+        """
+        上报一次请求结果
+        """
+        with self._lock:
+            stat = self._stats.get(key)
+            if stat is None:
+                return
+            if ok:
+                stat["success"] += 1
+                stat["alive"] = True
+                if latency is not None:
+                    stat["latency"] = latency if stat["latency"] is None \
+                        else self.EWMA_ALPHA * latency + (1 - self.EWMA_ALPHA) * stat["latency"]
+            else:
+                stat["failure"] += 1
+                stat["alive"] = False
+
+    def _check_one(self, key: str):
+        start = time.monotonic()
+        try:
+            resp = requests.head(self._check_url, proxies=self._proxies[key],
+                                 timeout=self._timeout, allow_redirects=False)
+            resp.close()
+            ok = resp.status_code < 500
+        except requests.RequestException:
+            ok = False
+        latency = time.monotonic() - start
+        self.report(key, ok, latency if ok else None)
+        with self._lock:
+            self._stats[key]["checked_at"] = time.time()
+
+    def check(self):
+        """
+        并发检查全部代理
+        """
+        if not self._proxies:
+            return
+        with ThreadPoolExecutor(max_workers=min(len(self._proxies), 8)) as executor:
+            list(executor.map(self._check_one, list(self._proxies)))
+
+    def status(self) -> List[Dict[str, Any]]:
+        """
+        代理状态，按排序返回
+        """
+        ranked = self.ranked()
+        with self._lock:
+            return [{"proxy": self.mask(key), **self._stats[key]} for key in ranked]
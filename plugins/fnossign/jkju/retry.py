@@ -0,0 +1,158 @@
+import heapq
+import itertools
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+# 论坛所在时区，签到按该时区的自然日计算
+FORUM_TZ = "Asia/Shanghai"
+
+
+def day_deadline(now: datetime, tz: str = FORUM_TZ) -> datetime:
+    """
+    论坛当天签到的截止时间，即论坛时区的下一个零点
+    """
+    local = now.astimezone(ZoneInfo(tz))
+    return (local + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def forum_day(now: datetime = None, tz: str = FORUM_TZ) -> str:
+    """
+    论坛时区的当天日期
+    """
+    return (now.astimezone(ZoneInfo(tz)) if now else datetime.now(ZoneInfo(tz))).strftime('%Y-%m-%d')
+
+
+class RetryQueue:
+    """
+    截止时间感知的重试队列：签到按自然日计算，零点之后的重试没有意义
+    重试间隔按次数递增，越接近截止时间越压缩，保证剩余的重试次数在零点前都能执行，来不及完成的重试直接放弃
+    队列按到期时间排序，同时到期时离截止时间近的账号优先
+    """
+
+    def __init__(self, interval: float, max_attempts: int, attempt_seconds: float = 120,
+                 min_delay: float = 300, tz: str = FORUM_TZ):
+        """
+        :param interval: 重试间隔(小时)，第n次重试在失败后 interval*n 小时执行
+        :param max_attempts: 最大重试次数
+        :param attempt_seconds: 一次签到预计耗时(秒)，截止前不足该时间的重试直接放弃
+        :param min_delay: 最短重试间隔(秒)
+        :param tz: 论坛时区
+        """
+        self.interval = interval
+        self.max_attempts = max_attempts
+        self.attempt_seconds = attempt_seconds
+        self.min_delay = min_delay
+        self.tz = tz
+        self._lock = threading.Lock()
+        # 堆元素：(到期时间, 截止时间, 序号, 账号, 重试次数)
+        self._heap: List[Tuple[datetime, datetime, int, str, int]] = []
+        # 每个账号只保留最新一次入队，堆中旧的元素出队时丢弃
+        self._latest: Dict[str, int] = {}
+        self._seq = itertools.count()
+
+    def push(self, username: str, attempt: int, now: datetime) -> Optional[datetime]:
+        """
+        安排账号的第attempt次重试
+        :return: 重试时间，截止前来不及重试时返回空
+        """
+        deadline = day_deadline(now, self.tz)
+        # 截止前可用于重试的时间，要给最后一次签到留出执行时间
+        remaining = (deadline - now).total_seconds() - self.attempt_seconds
+        if remaining <= 0:
+            self.remove(username)
+            return None
+        # 剩余的重试次数平分剩余时间，越接近截止时间间隔越短
+        attempts_left = max(1, self.max_attempts - attempt + 1)
+        delay = min(self.interval * attempt * 3600, remaining / attempts_left)
+        delay = max(delay, min(self.min_delay, remaining))
+        due = now + timedelta(seconds=delay)
+        self._push(username, attempt, due, deadline)
+        return due
+
+    def _push(self, username: str, attempt: int, due: datetime, deadline: datetime):
+        with self._lock:
+            seq = next(self._seq)
+            self._latest[username] = seq
+            heapq.heappush(self._heap, (due, deadline, seq, username, attempt))
+
+    def pop_due(self, now: datetime) -> List[Tuple[str, int]]:
+        """
+        取出已到期的重试，超过截止时间的重试直接丢弃
+        :return: [(账号, 重试次数)]
+        """
+        due_items = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, deadline, seq, username, attempt = heapq.heappop(self._heap)
+                if self._latest.get(username) != seq:
+                    continue
+                del self._latest[username]
+                if (deadline - now).total_seconds() < self.attempt_seconds:
+                    continue
+                due_items.append((deadline, username, attempt))
+        return [(username, attempt) for _, username, attempt in sorted(due_items)]
+
+    def next_due(self) -> Optional[datetime]:
+        """
+        最近一次重试的时间
+        """
+        with self._lock:
+            while self._heap and self._latest.get(self._heap[0][3]) != self._heap[0][2]:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def due_of(self, username: str) -> Optional[datetime]:
+        """
+        账号的重试时间，未在队列中时返回空
+        """
+        with self._lock:
+            seq = self._latest.get(username)
+            for due, _, item_seq, _, _ in self._heap:
+                if item_seq == seq:
+                    return due
+        return None
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        导出队列中的重试，用于持久化
+        """
+        with self._lock:
+            return [{
+                "username": username,
+                "attempt": attempt,
+                "due": due.isoformat(),
+                "deadline": deadline.isoformat()
+            } for due, deadline, seq, username, attempt in sorted(self._heap)
+                if self._latest.get(username) == seq]
+
+    def restore(self, entries: List[Dict[str, Any]], now: datetime) -> int:
+        """
+        恢复持久化的重试，已过截止时间或超过最大重试次数的丢弃，已到期的保持到期状态
+        :return: 恢复的重试数
+        """
+        restored = 0
+        for entry in entries or []:
+            try:
+                due = datetime.fromisoformat(entry["due"])
+                deadline = datetime.fromisoformat(entry["deadline"])
+                attempt = int(entry["attempt"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if attempt > self.max_attempts or (deadline - now).total_seconds() < self.attempt_seconds:
+                continue
+            self._push(entry["username"], attempt, due, deadline)
+            restored += 1
+        return restored
+
+    def remove(self, username: str):
+        """
+        取消账号的重试
+        """
+        with self._lock:
+            self._latest.pop(username, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._latest)
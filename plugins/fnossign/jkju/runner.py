@@ -0,0 +1,92 @@
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from .client import JingKeJuClient, STATUS_FAILED
+from .lease import LEASE_RUNNING, LeaseStore
+from .retry import forum_day
+
+
+def run_concurrently(func: Callable[[Any], Any], items: Iterable[Any], workers: int = 1) -> Iterator[Any]:
+    """
+    并发执行，按完成顺序逐个返回结果
+    """
+    items = list(items)
+    if not items:
+        return
+    workers = max(1, min(int(workers or 1), len(items)))
+    if workers == 1:
+        for item in items:
+            yield func(item)
+        return
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jkju-signin") as executor:
+        futures = [executor.submit(func, item) for item in items]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def run_accounts(client: JingKeJuClient, accounts: List[Dict[str, Any]], workers: int = 1,
+                 warm_sessions: Dict[str, Dict[str, Any]] = None,
+                 lease: LeaseStore = None,
+                 wrap: Callable[[Callable], Callable] = None) -> Iterator[Dict[str, Any]]:
+    """
+    并发为多个账号签到，按完成顺序逐个返回签到结果
+    :param client: 签到客户端
+    :param accounts: 账号列表
+    :param workers: 并发数
+    :param warm_sessions: 预热会话，{账号: 预热会话}
+    :param lease: 多实例租约，为空时直接签到
+    :param wrap: 包装每个账号的签到函数，如RunProfiler.wrap
+    """
+    warm_sessions = warm_sessions or {}
+
+    def sign(account: Dict[str, Any]) -> Dict[str, Any]:
+        warm = warm_sessions.get(account["username"])
+        if lease is None:
+            return client.sign(account, warm=warm)
+        return sign_with_lease(client, lease, account, warm=warm)
+
+    return run_concurrently(wrap(sign) if wrap else sign, accounts, workers=workers)
+
+
+def sign_with_lease(client: JingKeJuClient, lease: LeaseStore, account: Dict[str, Any],
+                    warm: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    获得租约的实例签到并保存结果；其他实例已签到或正在签到时，等待并读取其签到结果
+    租约数据库不可用时（如共享目录上的数据库被锁定）不经租约直接签到，论坛会拒绝重复签到
+    """
+    username = account["username"]
+    day = forum_day()
+    try:
+        acquired, current = lease.acquire(username, day)
+        if not acquired and current["status"] == LEASE_RUNNING:
+            current = lease.wait(username, day, timeout=lease.ttl)
+            # 其他实例签到失败或已退出时接管
+            if not current or current["status"] in (LEASE_RUNNING, STATUS_FAILED):
+                acquired, current = lease.acquire(username, day)
+    except (sqlite3.Error, OSError) as e:
+        client.logger.event("lease_error", "读取签到租约失败，不经租约直接签到", logging.WARNING, account=username,
+                            error=str(e))
+        return client.sign(account, warm=warm)
+
+    if acquired:
+        result = client.sign(account, warm=warm)
+        # 论坛已受理的签到结果照常返回，租约到期后其他实例读取论坛状态即可得知已签到
+        try:
+            lease.complete(username, day, result)
+        except (sqlite3.Error, OSError) as e:
+            client.logger.event("lease_error", "保存签到租约失败", logging.WARNING, account=username, error=str(e))
+        return result
+
+    if warm:
+        client.release(warm)
+    if current and current["result"]:
+        result = dict(current["result"])
+        # 本实例之前已完成签到，直接返回保存的结果
+        if current["owner"] == lease.owner:
+            return result
+        result["message"] = f"{result['message']}（由其他实例签到）"
+        result["lease_owner"] = current["owner"]
+        return result
+    return client._result(username, STATUS_FAILED, "其他实例正在签到，等待结果超时")
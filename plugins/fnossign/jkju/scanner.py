@@ -0,0 +1,41 @@
+from typing import Dict, Pattern
+
+
+class TokenScanner:
+    """
+    分块增量扫描页面中的令牌（formhash、loginhash等）
+    只保留上一块末尾的一小段窗口，用于匹配跨块的内容，内存占用与页面大小无关
+    """
+
+    def __init__(self, patterns: Dict[str, Pattern], window: int = 4096):
+        """
+        :param patterns: {令牌名: 正则}，正则的第一个分组为令牌值
+        :param window: 跨块匹配保留的字符数，需大于单个令牌所在片段的长度
+        """
+        self._patterns = patterns
+        self._window = window
+        self._tail = ""
+        self.tokens: Dict[str, str] = {}
+
+    @property
+    def done(self) -> bool:
+        """
+        是否已找到全部令牌
+        """
+        return len(self.tokens) == len(self._patterns)
+
+    def feed(self, text: str) -> Dict[str, str]:
+        """
+        扫描新读取的内容，返回目前已找到的令牌
+        """
+        if self.done or not text:
+            return self.tokens
+        buffer = self._tail + text
+        for name, pattern in self._patterns.items():
+            if name in self.tokens:
+                continue
+            match = pattern.search(buffer)
+            if match:
+                self.tokens[name] = match.group(1)
+        self._tail = buffer[-self._window:]
+        return self.tokens
@@ -0,0 +1,107 @@
+import threading
+import time
+from typing import Dict, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from .transport import CachingAdapter
+
+
+class SessionPool:
+    """
+    会话池：每个账号一个会话，签到成功后保留登录状态供下次复用，失败或退出时确定性关闭
+    借出的会话同样由会话池跟踪，close()时一并关闭，不会遗留连接
+    所有会话挂载同一个传输适配器，共用连接池、DNS缓存和TLS会话
+    """
+
+    def __init__(self, max_idle: float = 2 * 24 * 3600, adapter: HTTPAdapter = None):
+        """
+        :param max_idle: 空闲会话最长保留时间(秒)，超时后关闭
+        :param adapter: 共享的传输适配器，默认新建CachingAdapter
+        """
+        self._max_idle = max_idle
+        self.adapter = adapter or CachingAdapter()
+        self._lock = threading.Lock()
+        # 空闲会话：{账号: (会话, 归还时间)}
+        self._idle: Dict[str, Tuple[requests.Session, float]] = {}
+        # 借出的会话：{id(会话): 会话}
+        self._in_use: Dict[int, requests.Session] = {}
+
+    def _new_session(self) -> requests.Session:
+        # 显式声明支持的压缩格式
+        session = requests.Session()
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        session.mount("https://", self.adapter)
+        session.mount("http://", self.adapter)
+        return session
+
+    @staticmethod
+    def _close_session(session: requests.Session):
+        # 先卸下共享适配器，避免关闭会话时关掉其他会话仍在使用的连接池
+        session.adapters.clear()
+        session.close()
+
+    def acquire(self, username: str) -> requests.Session:
+        """
+        借出账号的会话，没有可用会话时新建
+        """
+        self.prune()
+        with self._lock:
+            session, _ = self._idle.pop(username, (None, None))
+            if session is None:
+                session = self._new_session()
+            self._in_use[id(session)] = session
+            return session
+
+    def release(self, username: str, session: requests.Session):
+        """
+        归还会话，保留登录状态供下次复用
+        """
+        with self._lock:
+            if self._in_use.pop(id(session), None) is None:
+                return
+            old = self._idle.pop(username, None)
+            self._idle[username] = (session, time.monotonic())
+        if old and old[0] is not session:
+            self._close_session(old[0])
+
+    def discard(self, session: requests.Session):
+        """
+        关闭并丢弃会话
+        """
+        with self._lock:
+            self._in_use.pop(id(session), None)
+        self._close_session(session)
+
+    def prune(self):
+        """
+        关闭超过空闲时间的会话
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [username for username, (_, released_at) in self._idle.items()
+                       if now - released_at > self._max_idle]
+            sessions = [self._idle.pop(username)[0] for username in expired]
+        for session in sessions:
+            self._close_session(session)
+
+    def close(self):
+        """
+        关闭全部会话，包括借出未归还的会话
+        """
+        with self._lock:
+            sessions = [session for session, _ in self._idle.values()] + list(self._in_use.values())
+            self._idle.clear()
+            self._in_use.clear()
+        for session in sessions:
+            self._close_session(session)
+        self.adapter.close()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        会话数量统计
+        """
+        with self._lock:
+            return {"idle": len(self._idle), "in_use": len(self._in_use)}
@@ -0,0 +1,119 @@
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+# 历史记录中表示签到成功的状态
+SUCCESS_STATUSES = ("签到成功", "已签到")
+
+
+class SignSummary:
+    """
+    签到摘要：随历史记录写入增量更新，仪表盘直接读取，不再遍历历史记录
+    记录当天各账号的签到情况、连续签到天数和最近一次签到趋势
+    """
+
+    def __init__(self, state: Dict[str, Any] = None):
+        """
+        :param state: 保存的摘要数据
+        """
+        self._lock = threading.Lock()
+        state = dict(state or {})
+        # 摘要对应的日期，及当天签到成功、仍失败的账号
+        self._day: Optional[str] = state.get("day")
+        self._succeeded = list(state.get("succeeded") or [])
+        self._failed = list(state.get("failed") or [])
+        # 连续签到天数：当天参与签到的账号全部成功才计入
+        self._streak = int(state.get("streak") or 0)
+        self._streak_day: Optional[str] = state.get("streak_day")
+        self._last: Optional[Dict[str, Any]] = state.get("last")
+        self._trend: Optional[Dict[str, Any]] = state.get("trend")
+
+    @classmethod
+    def from_history(cls, history: Iterable[Dict[str, Any]]) -> "SignSummary":
+        """
+        由历史记录重建摘要，仅在没有保存的摘要时使用
+        """
+        summary = cls()
+        # 按天分批更新，连续签到天数按每天最终的结果计算
+        batch, batch_day = [], None
+        for record in sorted(history, key=lambda item: item.get("date", "")):
+            day = record.get("date", "")[:10]
+            if batch and day != batch_day:
+                summary.update(batch)
+                batch = []
+            batch.append(record)
+            batch_day = day
+        if batch:
+            summary.update(batch)
+        return summary
+
+    def update(self, records: Iterable[Dict[str, Any]]):
+        """
+        写入一批历史记录，一轮签到的记录一起写入后再计算连续签到天数
+        """
+        with self._lock:
+            for record in records:
+                day = record.get("date", "")[:10]
+                if not day or (self._day and day < self._day):
+                    continue
+                if day != self._day:
+                    self._day, self._succeeded, self._failed = day, [], []
+                account = record.get("account", "")
+                success = record.get("status") in SUCCESS_STATUSES
+                if success:
+                    if account not in self._succeeded:
+                        self._succeeded.append(account)
+                    if account in self._failed:
+                        self._failed.remove(account)
+                elif account not in self._succeeded and account not in self._failed:
+                    self._failed.append(account)
+                self._last = {"date": record.get("date"), "account": account, "status": record.get("status")}
+                if success and record.get("trend"):
+                    self._trend = {"date": record.get("date"), "account": account, "text": record.get("trend")}
+            if self._day and self._succeeded and not self._failed and self._streak_day != self._day:
+                yesterday = (datetime.strptime(self._day, '%Y-%m-%d').date() - timedelta(days=1)).isoformat()
+                self._streak = self._streak + 1 if self._streak_day == yesterday else 1
+                self._streak_day = self._day
+
+    def snapshot(self, today: date = None) -> Dict[str, Any]:
+        """
+        仪表盘展示的摘要，日期变化后当天的统计清零，昨天之前中断的连续签到天数为0
+        """
+        today = today or date.today()
+        today_str = today.isoformat()
+        yesterday = (today - timedelta(days=1)).isoformat()
+        with self._lock:
+            is_today = self._day == today_str
+            return {
+                "today": {
+                    "succeeded": len(self._succeeded) if is_today else 0,
+                    "failed": len(self._failed) if is_today else 0
+                },
+                "streak": self._streak if self._streak_day and self._streak_day >= yesterday else 0,
+                "last": dict(self._last) if self._last else None,
+                "trend": dict(self._trend) if self._trend else None
+            }
+
+    def attempted(self, today: date = None) -> List[str]:
+        """
+        当天已有签到记录的账号
+        """
+        with self._lock:
+            if self._day != (today or date.today()).isoformat():
+                return []
+            return self._succeeded + self._failed
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        导出摘要，用于持久化
+        """
+        with self._lock:
+            return {
+                "day": self._day,
+                "succeeded": list(self._succeeded),
+                "failed": list(self._failed),
+                "streak": self._streak,
+                "streak_day": self._streak_day,
+                "last": self._last,
+                "trend": self._trend
+            }
@@ -0,0 +1,172 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+# 记录时脱敏的表单字段
+REDACT_FIELDS = ("password",)
+# 不记录的响应头：Cookie包含登录凭证；正文已解压保存，编码和长度头在回放时不再适用
+DROP_HEADERS = ("set-cookie", "content-encoding", "content-length", "transfer-encoding")
+
+
+def load_transcript(path: str) -> List[Dict[str, Any]]:
+    """
+    读取请求记录，每行一条
+    """
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _redact_body(body: Any) -> Optional[str]:
+    if body is None:
+        return None
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    fields = parse_qsl(body, keep_blank_values=True)
+    if not fields:
+        return body
+    return urlencode([(key, "***" if key in REDACT_FIELDS else value) for key, value in fields])
+
+
+class TranscriptRecorder(HTTPAdapter):
+    """
+    记录请求和响应：包装实际使用的传输适配器，把每次请求的方法、地址、表单、状态码、响应头、正文和耗时追加到JSONL文件
+    密码和Cookie不会被记录；为了保存完整正文，记录时会读完整个响应，不再提前结束读取
+    """
+
+    def __init__(self, adapter: HTTPAdapter, path: str = None, store_body: bool = True):
+        """
+        :param adapter: 实际发送请求的适配器
+        :param path: 记录文件路径，为空时不记录
+        :param store_body: 是否保存正文，不保存时只记录正文的哈希，无法回放
+        """
+        super().__init__()
+        self.adapter = adapter
+        self.path = path
+        self.store_body = store_body
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        start = time.perf_counter()
+        response = self.adapter.send(request, **kwargs)
+        if not self.path:
+            return response
+        body = response.content
+        entry = {
+            "method": request.method,
+            "url": request.url,
+            "request_body": _redact_body(request.body),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {key: value for key, value in response.headers.items()
+                        if key.lower() not in DROP_HEADERS},
+            "bytes": len(body),
+            "sha256": hashlib.sha256(body).hexdigest(),
+            "elapsed": round(time.perf_counter() - start, 4)
+        }
+        if self.store_body:
+            try:
+                entry["body"] = body.decode("utf-8")
+            except UnicodeDecodeError:
+                entry["body_b64"] = base64.b64encode(body).decode("ascii")
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        return self.adapter.stats() if hasattr(self.adapter, "stats") else {}
+
+    def close(self):
+        self.adapter.close()
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    离线回放请求记录：按方法和地址匹配记录的响应，同一地址的多次请求按记录顺序依次返回，用完后从头循环
+    地址完全一致的记录优先，找不到时按路径匹配，不发起任何网络请求
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._by_url: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._by_path: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._served: Dict[Tuple[str, str, str], int] = {}
+        self.replayed = 0
+        for entry in entries:
+            if "body" not in entry and "body_b64" not in entry:
+                continue
+            self._by_url.setdefault((entry["method"], entry["url"]), []).append(entry)
+            self._by_path.setdefault((entry["method"], urlsplit(entry["url"]).path), []).append(entry)
+
+    @classmethod
+    def from_file(cls, path: str) -> "ReplayAdapter":
+        return cls(load_transcript(path))
+
+    def accounts(self) -> List[str]:
+        """
+        记录中登录过的账号，回放时未指定账号可直接使用
+        """
+        usernames = []
+        for (method, _), entries in self._by_url.items():
+            if method != "POST":
+                continue
+            for entry in entries:
+                username = dict(parse_qsl(entry.get("request_body") or "")).get("username")
+                if username and username not in usernames:
+                    usernames.append(username)
+        return usernames
+
+    def _match(self, method: str, url: str) -> Optional[Dict[str, Any]]:
+        for kind, key in (("url", (method, url)), ("path", (method, urlsplit(url).path))):
+            entries = (self._by_url if kind == "url" else self._by_path).get(key)
+            if entries:
+                with self._lock:
+                    index = self._served.get((kind, *key), 0)
+                    self._served[(kind, *key)] = index + 1
+                    self.replayed += 1
+                return entries[index % len(entries)]
+        return None
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        entry = self._match(request.method, request.url)
+        if entry is None:
+            raise requests.exceptions.ConnectionError(f"请求记录中没有 {request.method} {request.url}", request=request)
+        if "body" in entry:
+            body = entry["body"].encode("utf-8")
+        else:
+            body = base64.b64decode(entry["body_b64"])
+        raw = HTTPResponse(
+            body=BytesIO(body),
+            headers=entry["headers"],
+            status=entry["status"],
+            reason=entry.get("reason"),
+            preload_content=False,
+            decode_content=False
+        )
+        return self.build_response(request, raw)
+
+    def reset(self):
+        """
+        从头开始回放
+        """
+        with self._lock:
+            self._served.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"replayed": self.replayed}
+
+    def close(self):
+        pass
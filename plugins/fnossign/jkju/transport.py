@@ -0,0 +1,217 @@
+import socket
+import ssl
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+from requests.adapters import DEFAULT_POOLBLOCK, HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.ssl_ import is_ipaddress
+
+
+class DnsCache:
+    """
+    带TTL的DNS缓存，多个账号、多次重试共用解析结果
+    """
+
+    def __init__(self, ttl: float = 300):
+        """
+        :param ttl: 解析结果缓存时间(秒)
+        """
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._cache: Dict[Tuple[str, int], Tuple[str, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, host: str, port: int) -> str:
+        """
+        解析主机名，返回IP地址
+        """
+        if is_ipaddress(host.strip("[]")):
+            return host
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[1] > now:
+                self.hits += 1
+                return cached[0]
+        infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        address = infos[0][4][0]
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = (address, now + self._ttl)
+        return address
+
+    def invalidate(self, host: str, port: int):
+        """
+        连接失败时丢弃缓存，下次重新解析
+        """
+        with self._lock:
+            self._cache.pop((host, port), None)
+
+
+class _SessionSavingSSLSocket(ssl.SSLSocket):
+    """
+    关闭连接前保存会话，TLS1.3的会话票据在握手后随响应下发，关闭时才是最新的
+    """
+
+    def _real_close(self):
+        if self._sslobj is not None and self.server_hostname:
+            self.context.save_session(self.server_hostname, self.session)
+        super()._real_close()
+
+
+class ResumingSSLContext(ssl.SSLContext):
+    """
+    复用TLS会话的SSLContext：同一主机的新连接带上上次的会话票据，减少完整握手
+    所有连接共用同一个SSLContext，CA证书只加载一次
+    """
+    sslsocket_class = _SessionSavingSSLSocket
+
+    @classmethod
+    def create(cls) -> "ResumingSSLContext":
+        context = cls(ssl.PROTOCOL_TLS_CLIENT)
+        context.minimum_version = ssl.TLSVersion.TLSv1_2
+        context.options |= ssl.OP_NO_COMPRESSION
+        context._init_state()
+        return context
+
+    def _init_state(self):
+        self._state_lock = threading.Lock()
+        self._loaded_locations = set()
+        # {主机名: (最近一次连接的弱引用, 会话)}
+        self._sessions: Dict[str, Tuple[Any, Optional[ssl.SSLSession]]] = {}
+        self.handshakes = 0
+        self.resumed = 0
+        self.handshake_time = 0.0
+
+    def load_verify_locations(self, cafile=None, capath=None, cadata=None):
+        # urllib3每建立一个连接都会加载一次CA证书，相同的证书只加载一次
+        key = (cafile, capath, cadata)
+        with self._state_lock:
+            if key in self._loaded_locations:
+                return
+        super().load_verify_locations(cafile, capath, cadata)
+        with self._state_lock:
+            self._loaded_locations.add(key)
+
+    def save_session(self, server_hostname: str, session: Optional[ssl.SSLSession]):
+        """
+        保存可复用的会话
+        """
+        if session is None or not session.has_ticket:
+            return
+        with self._state_lock:
+            ref, _ = self._sessions.get(server_hostname, (None, None))
+            self._sessions[server_hostname] = (ref, session)
+
+    def _get_session(self, server_hostname: str) -> Optional[ssl.SSLSession]:
+        with self._state_lock:
+            ref, session = self._sessions.get(server_hostname, (None, None))
+        # TLS1.3的会话票据在握手后才下发，优先从仍然存活的上一个连接取最新会话
+        sock = ref() if ref else None
+        if sock is not None:
+            try:
+                live = sock.session
+            except (OSError, ValueError):
+                live = None
+            if live is not None and live.has_ticket:
+                return live
+        return session
+
+    def wrap_socket(self, sock, server_side=False, do_handshake_on_connect=True,
+                    suppress_ragged_eofs=True, server_hostname=None, session=None):
+        if session is None and server_hostname and not server_side:
+            session = self._get_session(server_hostname)
+        start = time.monotonic()
+        ssl_sock = super().wrap_socket(sock, server_side=server_side,
+                                       do_handshake_on_connect=do_handshake_on_connect,
+                                       suppress_ragged_eofs=suppress_ragged_eofs,
+                                       server_hostname=server_hostname, session=session)
+        with self._state_lock:
+            self.handshakes += 1
+            self.handshake_time += time.monotonic() - start
+            if ssl_sock.session_reused:
+                self.resumed += 1
+            if server_hostname and not server_side:
+                _, session = self._sessions.get(server_hostname, (None, None))
+                self._sessions[server_hostname] = (weakref.ref(ssl_sock), session)
+        return ssl_sock
+
+
+class _CachedDnsMixin:
+    """
+    建立连接时使用DNS缓存，证书校验和SNI仍使用原主机名
+    """
+    resolver: DnsCache = None
+    stats: Dict[str, float] = None
+
+    def _new_conn(self):
+        host = self._dns_host
+        start = time.monotonic()
+        try:
+            self._dns_host = self.resolver.resolve(host, self.port)
+        except OSError:
+            # 解析失败交给urllib3处理，保持原有的异常类型
+            pass
+        try:
+            return super()._new_conn()
+        except Exception:
+            self.resolver.invalidate(host, self.port)
+            raise
+        finally:
+            self._dns_host = host
+            self.stats["connections"] += 1
+            self.stats["connect_time"] += time.monotonic() - start
+
+
+class CachingAdapter(HTTPAdapter):
+    """
+    共享传输层：多个会话挂载同一个适配器，共用连接池、DNS缓存和TLS会话
+    """
+
+    def __init__(self, resolver: DnsCache = None, ssl_context: ResumingSSLContext = None, **kwargs):
+        self.resolver = resolver or DnsCache()
+        self.ssl_context = ssl_context or ResumingSSLContext.create()
+        self._conn_stats = {"connections": 0, "connect_time": 0.0}
+        attrs = {"resolver": self.resolver, "stats": self._conn_stats}
+        http_conn = type("CachedDnsHTTPConnection", (_CachedDnsMixin, HTTPConnection), attrs)
+        https_conn = type("CachedDnsHTTPSConnection", (_CachedDnsMixin, HTTPSConnection), attrs)
+        self._pool_classes = {
+            "http": type("CachedDnsHTTPConnectionPool", (HTTPConnectionPool,), {"ConnectionCls": http_conn}),
+            "https": type("CachedDnsHTTPSConnectionPool", (HTTPSConnectionPool,), {"ConnectionCls": https_conn}),
+        }
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=DEFAULT_POOLBLOCK, **pool_kwargs):
+        pool_kwargs.setdefault("ssl_context", self.ssl_context)
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = self._pool_classes
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        if proxy in self.proxy_manager:
+            return self.proxy_manager[proxy]
+        # SOCKS代理使用自己的连接类，只共享TLS会话
+        proxy_kwargs.setdefault("ssl_context", self.ssl_context)
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        if not proxy.lower().startswith("socks"):
+            manager.pool_classes_by_scheme = self._pool_classes
+        return manager
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        传输层统计：新建连接数及耗时、TLS握手及复用次数、DNS缓存命中
+        """
+        return {
+            "connections": self._conn_stats["connections"],
+            "connect_time": round(self._conn_stats["connect_time"], 3),
+            "handshakes": self.ssl_context.handshakes,
+            "resumed": self.ssl_context.resumed,
+            "handshake_time": round(self.ssl_context.handshake_time, 3),
+            "dns_hits": self.resolver.hits,
+            "dns_misses": self.resolver.misses
+        }
@@ -0,0 +1,130 @@
+"""
+镜客居签到命令行脚本，复用插件的签到核心，无需启动MoviePilot
+
+    python main.py -u "用户名" -p "密码"
+    python main.py -u "邮箱" -p "密码" -m "email"
+    python main.py -f accounts.txt -j 4 --json
+    python main.py -u "用户名" -p "密码" --record transcript.jsonl
+    python main.py --replay transcript.jsonl --repeat 50
+"""
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+
+from jkju import CachingAdapter, JingKeJuClient, LeaseStore, ProxyPool, ReplayAdapter, SessionPool, STATUS_FAILED, \
+    TranscriptRecorder, parse_accounts, run_accounts
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="镜客居论坛自动签到")
+    parser.add_argument("-u", "--username", help="用户名或邮箱")
+    parser.add_argument("-p", "--password", help="密码")
+    parser.add_argument("-m", "--mode", choices=["username", "email"], default="username",
+                        help="登录方式，默认username")
+    parser.add_argument("-f", "--file",
+                        help="账号文件，每行一个：账号#密码，邮箱登录追加 #email，- 表示从标准输入读取")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="并发签到账号数，默认1")
+    parser.add_argument("--proxy", action="append", default=[], help="代理地址，可重复指定")
+    parser.add_argument("--lease", help="多实例租约文件，多台机器共用时每个账号每天只签到一次")
+    parser.add_argument("--record", metavar="FILE", help="把请求和响应记录到文件（密码和Cookie不记录），用于离线回放")
+    parser.add_argument("--replay", metavar="FILE", help="离线回放记录文件，不发起网络请求，未指定账号时使用记录中的账号")
+    parser.add_argument("--repeat", type=int, default=1, help="回放次数，输出每次耗时的统计，用于比较改动前后的性能")
+    parser.add_argument("--json", action="store_true", help="以JSON格式输出签到结果")
+    parser.add_argument("--stats", action="store_true", help="结束后输出连接统计（新建连接、TLS握手复用、DNS缓存命中）")
+    parser.add_argument("-v", "--verbose", action="store_true", help="输出详细日志")
+    return parser.parse_args(argv)
+
+
+def load_accounts(args) -> list:
+    """
+    从命令行参数和账号文件中读取账号
+    """
+    accounts = []
+    if args.username and args.password:
+        accounts.append({
+            "username": args.username,
+            "password": args.password,
+            "is_email": args.mode == "email"
+        })
+    if args.file:
+        if args.file == "-":
+            accounts.extend(parse_accounts(sys.stdin.read()))
+        else:
+            with open(args.file, encoding="utf-8") as f:
+                accounts.extend(parse_accounts(f.read()))
+    return accounts
+
+
+def sign_accounts(args, accounts: list, adapter, proxy_pool=None, lease=None, output=True) -> list:
+    """
+    为全部账号签到一次
+    :param adapter: 传输适配器
+    :param output: 是否逐个输出签到结果
+    """
+    client = JingKeJuClient(proxy_pool=proxy_pool, session_pool=SessionPool(adapter=adapter))
+    results = []
+    try:
+        for result in run_accounts(client, accounts, workers=args.jobs, lease=lease):
+            results.append(result)
+            if output and not args.json:
+                mark = "❌" if result["status"] == STATUS_FAILED else "✅"
+                print(f"{mark} {result['username']}｜{result['message']}（{result['elapsed']}s）")
+                if result["trend"]:
+                    print(result["trend"])
+    finally:
+        if output and args.stats:
+            print(json.dumps(adapter.stats(), ensure_ascii=False), file=sys.stderr)
+        client.close()
+    return results
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s %(levelname)s %(message)s",
+        stream=sys.stderr
+    )
+
+    replay = ReplayAdapter.from_file(args.replay) if args.replay else None
+    accounts = load_accounts(args)
+    if not accounts and replay:
+        accounts = [{"username": username, "password": "***", "is_email": False} for username in replay.accounts()]
+    if not accounts:
+        print("未配置账号，请使用 -u/-p 或 -f 指定账号", file=sys.stderr)
+        return 2
+
+    lease = LeaseStore(args.lease) if args.lease else None
+    if replay:
+        # 离线回放：按顺序重复执行，统计每次耗时
+        timings = []
+        results = []
+        for index in range(max(args.repeat, 1)):
+            replay.reset()
+            start = time.perf_counter()
+            results = sign_accounts(args, accounts, replay, lease=lease, output=index == 0)
+            timings.append(time.perf_counter() - start)
+        print(f"回放{len(timings)}次，耗时 最短 {min(timings):.4f}s，中位 {statistics.median(timings):.4f}s，"
+              f"平均 {statistics.mean(timings):.4f}s", file=sys.stderr)
+    else:
+        proxy_pool = None
+        if args.proxy:
+            proxy_pool = ProxyPool(args.proxy, check_url=JingKeJuClient.BASE_URL,
+                                   timeout=JingKeJuClient.REQUEST_TIMEOUT[0])
+            proxy_pool.check()
+        adapter = CachingAdapter()
+        if args.record:
+            adapter = TranscriptRecorder(adapter, args.record)
+        results = sign_accounts(args, accounts, adapter, proxy_pool=proxy_pool, lease=lease)
+
+    if args.json:
+        json.dump(results, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    return 1 if any(result["status"] == STATUS_FAILED for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""
+传输层基准：对本地HTTPS论坛替身签到，输出CachingAdapter的连接、TLS握手及复用统计
+分别测试服务器保持连接和每个响应后关闭连接两种情况，后者每个请求新建连接，可观察TLS会话复用
+
+    python tests/bench_transport.py [-r 轮数] [-n 账号数]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path[:0] = [os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "plugins", "fnossign"),
+                os.path.dirname(os.path.abspath(__file__))]
+
+from jkju import STATUS_SUCCESS, run_accounts  # noqa: E402
+from standin import StandInForum  # noqa: E402
+
+
+def bench(keep_alive: bool, rounds: int, accounts: int):
+    with StandInForum(tls=True) as forum:
+        forum.keep_alive = keep_alive
+        # 客户端不传verify，通过环境变量信任替身的自签名证书
+        os.environ["REQUESTS_CA_BUNDLE"] = forum.cert
+        client = forum.client_class()(logger=logging.getLogger("bench"))
+        users = [{"username": f"user{i}", "password": "secret"} for i in range(accounts)]
+        start = time.perf_counter()
+        try:
+            for _ in range(rounds):
+                forum.new_day()
+                results = run_accounts(client, users, workers=accounts)
+                assert all(r["status"] == STATUS_SUCCESS for r in results), results
+            elapsed = time.perf_counter() - start
+            print(f"{'保持连接' if keep_alive else '关闭连接'}: {rounds}轮 x {accounts}个账号, "
+                  f"请求 {forum.requests} 个, 耗时 {elapsed:.3f}s")
+            print(f"  {client.sessions.adapter.stats()}")
+        finally:
+            client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="传输层基准")
+    parser.add_argument("-r", "--rounds", type=int, default=2, help="签到轮数")
+    parser.add_argument("-n", "--accounts", type=int, default=3, help="账号数")
+    args = parser.parse_args()
+    for keep_alive in (True, False):
+        bench(keep_alive, args.rounds, args.accounts)
+
+
+if __name__ == "__main__":
+    main()
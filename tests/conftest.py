@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 插件目录依赖MoviePilot，测试直接导入不依赖MoviePilot的jkju包
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "plugins", "fnossign"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,178 @@
+"""
+本地镜客居论坛替身：实现登录、签到页、签到三个接口，可注入延迟和失败，可选HTTPS
+测试和基准脚本共用，不发起任何外部请求
+"""
+import os
+import shutil
+import subprocess
+import ssl
+import tempfile
+import threading
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from jkju import JingKeJuClient
+
+LOGIN_PAGE = (
+    '<html><body><form method="post" name="login" id="loginform_LxX" '
+    'action="member.php?mod=logging&amp;action=login&amp;loginsubmit=yes&amp;loginhash=LxX">'
+    '<input type="hidden" name="formhash" value="login01" /></form></body></html>'
+)
+
+
+def sign_page(signed: bool, padding: int = 0) -> str:
+    button = "今日已打卡" if signed else "点击打卡"
+    return (
+        '<html><body><div id="hd"><form id="scbar_form" method="post">'
+        '<input type="hidden" name="formhash" value="sign01" /></form></div>'
+        '<div id="wp"><div class="ct2 cl"><div class="mn">main</div><div class="sd">'
+        f'<div class="bm signbtn cl"><a href="#">{button}</a></div>'
+        '<div class="bm">x</div>'
+        '<div class="bm"><div class="bm_c"><ul><li>连续打卡 3 天</li><li>积分 +5</li></ul></div></div>'
+        f'</div></div></div><!-- {"x" * padding} --></body></html>'
+    )
+
+
+def make_certificate(directory: str) -> Tuple[str, str]:
+    """
+    用openssl生成localhost的自签名证书
+    :return: (证书路径, 私钥路径)
+    """
+    if not shutil.which("openssl"):
+        raise RuntimeError("需要openssl命令生成测试证书")
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                    "-keyout", key, "-out", cert, "-subj", "/CN=localhost",
+                    "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1"],
+                   check=True, capture_output=True)
+    return cert, key
+
+
+class StandInForum:
+    """
+    论坛替身：登录后以Cookie区分账号，每个账号每天只能签到一次，new_day()模拟跨天
+    latency、failing可在运行中修改，用于模拟随时间变化的负载
+    """
+
+    def __init__(self, tls: bool = False, padding: int = 0):
+        """
+        :param tls: 是否使用自签名证书提供HTTPS
+        :param padding: 签到页填充的字节数，模拟完整页面的大小
+        """
+        self.padding = padding
+        # 每个请求的处理延迟(秒)
+        self.latency: Callable[[], float] = lambda: 0.0
+        # 签到请求是否返回503
+        self.failing: Callable[[], bool] = lambda: False
+        # 为False时每个响应后关闭连接，模拟不保持连接的服务器
+        self.keep_alive = True
+        self.signed: Set[str] = set()
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._tmpdir: Optional[str] = None
+        self.cert: Optional[str] = None
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        if tls:
+            self._tmpdir = tempfile.mkdtemp()
+            self.cert, key = make_certificate(self._tmpdir)
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(self.cert, key)
+            self._server.socket = context.wrap_socket(self._server.socket, server_side=True)
+        self.port = self._server.server_address[1]
+        self.base_url = f"{'https' if tls else 'http'}://{'localhost' if tls else '127.0.0.1'}:{self.port}/"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "StandInForum":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._tmpdir:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+
+    def new_day(self):
+        with self._lock:
+            self.signed.clear()
+
+    def client_class(self) -> type:
+        """
+        指向替身地址的客户端类
+        """
+        base = self.base_url
+        return type("StandInClient", (JingKeJuClient,), {
+            "BASE_URL": base,
+            "LOGIN_PAGE": base + "member.php",
+            "LOGIN_URL": base + "member.php",
+            "SIGN_URL": base + "plugin.php",
+            "SIGN_PAGE_URL": base + "plugin.php?id=zqlj_sign",
+        })
+
+    def _handler(self) -> type:
+        forum = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # 响应头和正文分两次写出，关闭Nagle算法避免保持连接时每个请求等待延迟确认
+            disable_nagle_algorithm = True
+
+            def _send(self, body: str, code: int = 200, headers: dict = None):
+                data = body.encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                if not forum.keep_alive:
+                    self.send_header("Connection", "close")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _account(self) -> Optional[str]:
+                morsel = SimpleCookie(self.headers.get("Cookie", "")).get("auth")
+                return morsel.value if morsel else None
+
+            def _begin(self):
+                with forum._lock:
+                    forum.requests += 1
+                delay = forum.latency()
+                if delay:
+                    threading.Event().wait(delay)
+
+            def do_GET(self):
+                self._begin()
+                url = urlsplit(self.path)
+                query = parse_qs(url.query)
+                account = self._account()
+                if url.path.endswith("member.php"):
+                    return self._send(LOGIN_PAGE)
+                if url.path.endswith("plugin.php") and "sign" in query:
+                    if forum.failing():
+                        return self._send("Service Unavailable", code=503)
+                    with forum._lock:
+                        if account in forum.signed:
+                            return self._send("您今天已经打过卡了，请勿重复操作！")
+                        forum.signed.add(account)
+                    return self._send("恭喜您，打卡成功！")
+                if url.path.endswith("plugin.php"):
+                    if not account:
+                        return self._send("<html><body>请先登录</body></html>")
+                    return self._send(sign_page(account in forum.signed, forum.padding))
+                self._send("ok")
+
+            def do_POST(self):
+                self._begin()
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8")
+                form = {key: values[0] for key, values in parse_qs(body).items()}
+                if form.get("password") == "bad":
+                    return self._send("登录失败，您还可以尝试 4 次")
+                self._send("欢迎您回来", headers={"Set-Cookie": f"auth={form.get('username')}; Path=/"})
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
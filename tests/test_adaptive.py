@@ -0,0 +1,102 @@
+"""
+自适应签到时间测试：论坛替身的延迟和失败随模拟的小时变化，检查HourlyStats最终选中代价最低的小时
+"""
+import hashlib
+import logging
+from datetime import date, timedelta
+
+import pytest
+import pytz
+
+from jkju import STATUS_FAILED, HourlyStats, parse_window
+from standin import StandInForum
+
+# 8点慢、9点正常、10点签到请求全部失败
+WINDOW = (8, 10)
+SLOW_HOUR, GOOD_HOUR, FAILING_HOUR = 8, 9, 10
+
+
+def test_parse_window():
+    assert parse_window("8-22") == (8, 22)
+    assert parse_window("9") == (9, 9)
+    for text in ("", "22-8", "8-24", "a-b"):
+        with pytest.raises(ValueError):
+            parse_window(text)
+
+
+def test_best_hour_samples_every_hour_first():
+    stats = HourlyStats()
+    chosen = []
+    for _ in range(HourlyStats.MIN_SAMPLES * 3):
+        hour = stats.best_hour(*WINDOW)
+        chosen.append(hour)
+        stats.record(hour, 0.1, True)
+    # 样本不足的小时按时间顺序依次尝试
+    assert chosen == [8, 8, 9, 9, 10, 10]
+
+
+def test_best_hour_prefers_lowest_cost():
+    stats = HourlyStats()
+    for _ in range(4):
+        stats.record(8, 2.0, True)
+        stats.record(9, 0.5, True)
+        stats.record(10, 0.1, False)
+    assert stats.best_hour(*WINDOW) == 9
+    # 代价相同时取较早的小时
+    tie = HourlyStats({"8": {"runs": 3, "failures": 0, "latency": 1.0},
+                       "9": {"runs": 3, "failures": 0, "latency": 1.0}})
+    assert tie.best_hour(8, 9) == 8
+
+
+def test_stats_survive_persistence():
+    stats = HourlyStats()
+    stats.record(9, 1.0, True)
+    stats.record(9, 2.0, False)
+    restored = HourlyStats(stats.to_dict())
+    assert restored.to_dict() == stats.to_dict() == {"9": {"runs": 2, "failures": 1, "latency": 1.3}}
+
+
+def test_choose_time_is_stable_per_day():
+    stats = HourlyStats({str(hour): {"runs": 5, "failures": 0, "latency": 1.0 + abs(hour - 9)}
+                         for hour in range(8, 11)})
+    tz = pytz.timezone("Asia/Shanghai")
+    day = date(2024, 3, 1)
+    chosen = stats.choose_time(day, *WINDOW, tzinfo=tz)
+    assert chosen == stats.choose_time(day, *WINDOW, tzinfo=tz)
+    assert chosen.hour == 9
+    assert chosen.minute == int(hashlib.sha1(day.isoformat().encode()).hexdigest(), 16) % 60
+    assert chosen.utcoffset() == timedelta(hours=8)
+    # 分钟随日期变化，小时始终在时间窗口内
+    minutes = set()
+    for offset in range(30):
+        other = stats.choose_time(day + timedelta(days=offset), *WINDOW)
+        assert WINDOW[0] <= other.hour <= WINDOW[1]
+        minutes.add(other.minute)
+    assert len(minutes) > 1
+
+
+def test_adaptive_converges_on_stand_in():
+    with StandInForum() as forum:
+        clock = {"hour": None}
+        forum.latency = lambda: 0.1 if clock["hour"] == SLOW_HOUR else 0.0
+        forum.failing = lambda: clock["hour"] == FAILING_HOUR
+        client = forum.client_class()(logger=logging.getLogger("adaptive"))
+        stats = HourlyStats()
+        day = date(2024, 3, 1)
+        chosen = []
+        try:
+            # 每天按统计选择签到时间，在替身上签到并记录结果
+            for offset in range(12):
+                forum.new_day()
+                clock["hour"] = stats.choose_time(day + timedelta(days=offset), *WINDOW).hour
+                chosen.append(clock["hour"])
+                result = client.sign({"username": "user", "password": "secret"})
+                stats.record(clock["hour"], result["elapsed"], result["status"] != STATUS_FAILED)
+        finally:
+            client.close()
+    samples = HourlyStats.MIN_SAMPLES * 3
+    assert chosen[:samples] == [8, 8, 9, 9, 10, 10]
+    assert chosen[samples:] == [GOOD_HOUR] * (len(chosen) - samples)
+    hours = stats.to_dict()
+    assert hours[str(FAILING_HOUR)]["failures"] == HourlyStats.MIN_SAMPLES
+    assert hours[str(SLOW_HOUR)]["latency"] > hours[str(GOOD_HOUR)]["latency"]
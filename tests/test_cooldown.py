@@ -0,0 +1,39 @@
+"""
+账号冷却测试
+"""
+from jkju import FAILURE_CAPTCHA, FAILURE_CREDENTIAL, CooldownTracker
+
+NOW = 1_700_000_000.0
+
+
+def test_cooldown_doubles_per_repeated_failure():
+    tracker = CooldownTracker(6)
+    first = tracker.record("user", FAILURE_CAPTCHA, "需要验证码", now=NOW)
+    second = tracker.record("user", FAILURE_CAPTCHA, "需要验证码", now=NOW)
+    assert first["until"] - NOW == 6 * 3600
+    assert second["until"] - NOW == 12 * 3600
+    # 失败类型变化时重新计数，账号密码错误冷却更久
+    third = tracker.record("user", FAILURE_CREDENTIAL, "密码错误", now=NOW)
+    assert third["count"] == 1 and third["until"] - NOW == 24 * 3600
+    assert tracker.active("user", now=NOW + 23 * 3600)
+    assert tracker.active("user", now=NOW + 24 * 3600) is None
+
+
+def test_cooldown_is_capped():
+    tracker = CooldownTracker(24)
+    for _ in range(5):
+        entry = tracker.record("user", FAILURE_CREDENTIAL, "密码错误", now=NOW)
+    assert entry["until"] - NOW == CooldownTracker.MAX_HOURS * 3600
+
+
+def test_disabled_tracker_ignores_existing_cooldowns():
+    tracker = CooldownTracker(6)
+    tracker.record("user", FAILURE_CAPTCHA, "需要验证码", now=NOW)
+    # 运行中关闭冷却
+    tracker.hours = 0
+    assert tracker.active("user", now=NOW) is None
+    assert tracker.record("user", FAILURE_CAPTCHA, "需要验证码", now=NOW) is None
+    # 以关闭冷却的配置恢复保存的状态
+    restored = CooldownTracker(0, state=CooldownTracker(6, state=tracker.to_dict()).to_dict())
+    assert restored.active("user", now=NOW) is None
+    assert restored.clear() == ["user"]
@@ -0,0 +1,66 @@
+"""
+签到租约测试：两个实例共用租约数据库，对本地论坛替身签到
+"""
+import logging
+import sqlite3
+
+import pytest
+
+from jkju import STATUS_SUCCESS, LeaseStore, run_accounts, sign_with_lease
+from standin import StandInForum
+
+ACCOUNT = {"username": "user", "password": "secret"}
+
+
+@pytest.fixture
+def client():
+    with StandInForum() as forum:
+        client = forum.client_class()(logger=logging.getLogger("lease"))
+        yield client
+        client.close()
+
+
+def test_own_result_is_returned_as_is(client, tmp_path):
+    lease = LeaseStore(str(tmp_path / "lease.db"))
+    first = sign_with_lease(client, lease, ACCOUNT)
+    again = sign_with_lease(client, lease, ACCOUNT)
+    assert first["status"] == again["status"] == STATUS_SUCCESS
+    # 本实例已完成签到，不标记为其他实例的结果
+    assert again["message"] == first["message"]
+    assert "lease_owner" not in again
+
+
+def test_other_instance_result_is_labelled(client, tmp_path):
+    path = str(tmp_path / "lease.db")
+    first = sign_with_lease(client, LeaseStore(path, owner="a"), ACCOUNT)
+    other = sign_with_lease(client, LeaseStore(path, owner="b"), ACCOUNT)
+    assert other["status"] == first["status"]
+    assert other["message"] == f"{first['message']}（由其他实例签到）"
+    assert other["lease_owner"] == "a"
+
+
+class LockedLease(LeaseStore):
+    """
+    模拟共享目录上被锁定的租约数据库
+    """
+
+    def __init__(self, path: str, fail_acquire: bool = False):
+        super().__init__(path)
+        self.fail_acquire = fail_acquire
+
+    def acquire(self, account, day):
+        if self.fail_acquire:
+            raise sqlite3.OperationalError("database is locked")
+        return super().acquire(account, day)
+
+    def complete(self, account, day, result):
+        raise sqlite3.OperationalError("database is locked")
+
+
+@pytest.mark.parametrize("fail_acquire", [False, True])
+def test_lease_errors_do_not_lose_results(client, tmp_path, fail_acquire):
+    lease = LockedLease(str(tmp_path / "lease.db"), fail_acquire=fail_acquire)
+    accounts = [{"username": f"user{i}", "password": "secret"} for i in range(3)]
+    results = list(run_accounts(client, accounts, workers=3, lease=lease))
+    assert sorted(result["username"] for result in results) == ["user0", "user1", "user2"]
+    assert all(result["status"] == STATUS_SUCCESS for result in results)
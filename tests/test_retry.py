@@ -0,0 +1,100 @@
+"""
+截止时间感知的重试队列测试，时间均为固定值
+"""
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from jkju import RetryQueue, day_deadline, forum_day
+
+TZ = ZoneInfo("Asia/Shanghai")
+
+
+def at(hour: int, minute: int = 0, second: int = 0) -> datetime:
+    return datetime(2024, 3, 1, hour, minute, second, tzinfo=TZ)
+
+
+MIDNIGHT = datetime(2024, 3, 2, tzinfo=TZ)
+
+
+def test_forum_day_and_deadline_use_forum_timezone():
+    # UTC 16:30 已是论坛时区的第二天
+    now = datetime(2024, 3, 1, 16, 30, tzinfo=timezone.utc)
+    assert forum_day(now) == "2024-03-02"
+    assert day_deadline(now) == datetime(2024, 3, 3, tzinfo=TZ)
+    assert day_deadline(at(22)) == MIDNIGHT
+
+
+def test_delay_grows_with_attempts_when_time_allows():
+    queue = RetryQueue(interval=1, max_attempts=3)
+    assert queue.push("user", 1, at(8)) == at(9)
+    assert queue.push("user", 2, at(8)) == at(10)
+
+
+def test_delay_is_compressed_near_midnight():
+    queue = RetryQueue(interval=2, max_attempts=3)
+    # 22:00 距截止7200秒，扣除一次签到的120秒后由剩余3次重试平分
+    assert queue.push("user", 1, at(22)) == at(22) + timedelta(seconds=(7200 - 120) / 3)
+    # 最后一次重试用完剩余时间，仍在截止前留出签到时间
+    assert queue.push("user", 3, at(22)) == at(23, 58)
+
+
+def test_min_delay_applies_and_is_capped_by_remaining_time():
+    queue = RetryQueue(interval=0, max_attempts=2)
+    assert queue.push("user", 1, at(22)) == at(22, 5)
+    # 23:55 只剩180秒可用，最短间隔不超过剩余时间
+    assert queue.push("user", 1, at(23, 55)) == at(23, 58)
+
+
+def test_push_too_close_to_midnight_drops_retry():
+    queue = RetryQueue(interval=2, max_attempts=3)
+    queue.push("user", 1, at(22))
+    assert queue.push("user", 2, at(23, 58)) is None
+    # 已安排的重试一并取消
+    assert queue.due_of("user") is None
+    assert len(queue) == 0
+
+
+def test_pop_due_drops_retries_past_the_budget():
+    queue = RetryQueue(interval=0, max_attempts=1)
+    queue.push("late", 1, at(23, 55))
+    queue.push("ok", 1, at(23, 50))
+    assert queue.pop_due(at(23, 54)) == []
+    assert queue.pop_due(at(23, 57)) == [("ok", 1)]
+    # 到期时距截止不足一次签到的时间，直接丢弃
+    assert queue.pop_due(at(23, 58, 30)) == []
+    assert len(queue) == 0
+
+
+def test_removed_and_replaced_entries_are_stale():
+    queue = RetryQueue(interval=1, max_attempts=3)
+    queue.push("a", 1, at(8))
+    queue.push("b", 1, at(8, 30))
+    queue.remove("a")
+    assert queue.next_due() == at(9, 30)
+    assert queue.due_of("a") is None
+    # 重新入队只保留最新一次
+    queue.push("b", 2, at(9))
+    assert [entry["attempt"] for entry in queue.entries()] == [2]
+    assert queue.pop_due(at(12)) == [("b", 2)]
+    assert queue.pop_due(at(12)) == []
+    assert queue.next_due() is None
+
+
+def test_restore_filters_expired_and_exhausted_entries():
+    queue = RetryQueue(interval=1, max_attempts=2)
+    queue.push("due", 1, at(8))
+    queue.push("later", 2, at(8))
+    saved = queue.entries()
+    saved += [
+        {"username": "exhausted", "attempt": 3, "due": at(9).isoformat(), "deadline": MIDNIGHT.isoformat()},
+        {"username": "yesterday", "attempt": 1, "due": at(9).isoformat(),
+         "deadline": (MIDNIGHT - timedelta(days=1)).isoformat()},
+        {"username": "broken", "attempt": "x"},
+    ]
+    restored = RetryQueue(interval=1, max_attempts=2)
+    assert restored.restore(saved, at(9, 30)) == 2
+    # 重启期间已到期的重试保持到期状态
+    assert restored.pop_due(at(9, 30)) == [("due", 1)]
+    assert restored.due_of("later") == at(10)
+    # 截止前不足一次签到时间时全部丢弃
+    assert RetryQueue(interval=1, max_attempts=2).restore(saved, at(23, 59)) == 0
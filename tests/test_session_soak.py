@@ -0,0 +1,65 @@
+"""
+会话池长时间运行测试：对本地论坛替身连续签到数千轮，检查文件描述符、线程数和内存不会持续增长
+轮数可用环境变量 SOAK_CYCLES 调整
+"""
+import gc
+import logging
+import os
+import sys
+import threading
+
+import pytest
+
+from jkju import STATUS_FAILED, STATUS_SUCCESS, run_accounts
+from standin import StandInForum
+
+CYCLES = int(os.environ.get("SOAK_CYCLES", "2000"))
+# 预热轮数，之后的资源占用作为基准
+WARMUP = 50
+ACCOUNTS = [{"username": f"user{i}", "password": "secret"} for i in range(3)]
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="需要/proc统计资源占用")
+
+
+def open_fds() -> int:
+    return len(os.listdir("/proc/self/fd"))
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+
+
+def test_session_pool_soak():
+    with StandInForum() as forum:
+        client = forum.client_class()(logger=logging.getLogger("soak"))
+        # 每10轮有一轮签到请求失败，失败的会话被关闭，下一轮重新登录
+        failing_cycle = {"value": False}
+        forum.failing = lambda: failing_cycle["value"]
+        baseline = None
+        statuses = {STATUS_SUCCESS: 0, STATUS_FAILED: 0}
+        try:
+            for cycle in range(WARMUP + CYCLES):
+                forum.new_day()
+                failing_cycle["value"] = cycle % 10 == 9
+                for result in run_accounts(client, ACCOUNTS, workers=3):
+                    statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+                if cycle == WARMUP - 1:
+                    gc.collect()
+                    baseline = (open_fds(), threading.active_count(), rss_mb())
+
+            gc.collect()
+            fds, threads, rss = open_fds(), threading.active_count(), rss_mb()
+            # 每个账号最多保留一个空闲会话和一条连接，替身每条连接一个处理线程
+            assert fds <= baseline[0] + len(ACCOUNTS), (baseline, fds)
+            assert threads <= baseline[1] + len(ACCOUNTS), (baseline, threads)
+            assert rss - baseline[2] < 32, (baseline, rss)
+            assert client.sessions.stats()["idle"] <= len(ACCOUNTS)
+            # 失败轮次的账号全部失败，其余轮次全部成功
+            expected_failed = sum(1 for cycle in range(WARMUP + CYCLES) if cycle % 10 == 9) * len(ACCOUNTS)
+            assert statuses[STATUS_FAILED] == expected_failed
+            assert statuses[STATUS_SUCCESS] == (WARMUP + CYCLES) * len(ACCOUNTS) - expected_failed
+        finally:
+            client.close()
+        gc.collect()
+        assert client.sessions.stats()["idle"] == 0
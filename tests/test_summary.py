@@ -0,0 +1,85 @@
+"""
+签到摘要测试：当天统计、连续签到天数和跨天清零
+"""
+from datetime import date
+
+from jkju import SignSummary
+
+
+def rec(day: str, account: str, status: str, clock: str = "09:30:00", trend: str = "") -> dict:
+    return {"date": f"{day} {clock}", "account": account, "status": status, "trend": trend}
+
+
+# 按轮次分批的历史记录：第2天b失败后重试成功，第3天b冷却中未签到成功，第4天起中断后重新开始
+RUNS = [
+    [rec("2024-03-01", "a", "签到成功", trend="连续打卡 1 天"), rec("2024-03-01", "b", "已签到", "09:30:01")],
+    [rec("2024-03-02", "a", "签到成功"), rec("2024-03-02", "b", "签到失败: 网络错误", "09:30:01")],
+    [rec("2024-03-02", "b", "签到成功", "11:30:00", trend="连续打卡 2 天")],
+    [rec("2024-03-03", "a", "签到成功"), rec("2024-03-03", "b", "签到失败: 需要验证码", "09:30:01")],
+    [rec("2024-03-05", "a", "签到成功"), rec("2024-03-05", "b", "签到成功", "09:30:01")],
+    [rec("2024-03-06", "a", "签到成功"), rec("2024-03-06", "b", "签到失败: 网络错误", "09:30:01")],
+]
+
+
+def replay(runs) -> SignSummary:
+    summary = SignSummary()
+    for records in runs:
+        summary.update(records)
+    return summary
+
+
+def test_streak_counts_only_days_where_every_account_succeeded():
+    summary = replay(RUNS[:2])
+    # 第2天b失败，连续天数停在第1天
+    assert summary.to_dict()["streak_day"] == "2024-03-01"
+    assert summary.snapshot(date(2024, 3, 2))["today"] == {"succeeded": 1, "failed": 1}
+    # 之后重试成功清除失败，当天计入
+    summary.update(RUNS[2])
+    assert summary.snapshot(date(2024, 3, 2))["today"] == {"succeeded": 2, "failed": 0}
+    assert summary.snapshot(date(2024, 3, 2))["streak"] == 2
+
+
+def test_failure_after_success_does_not_undo_the_day():
+    summary = SignSummary()
+    summary.update([rec("2024-03-01", "a", "签到成功")])
+    summary.update([rec("2024-03-01", "a", "签到失败: 网络错误", "11:30:00")])
+    assert summary.snapshot(date(2024, 3, 1))["today"] == {"succeeded": 1, "failed": 0}
+    assert summary.attempted(date(2024, 3, 1)) == ["a"]
+
+
+def test_streak_restarts_after_a_gap_and_expires_after_yesterday():
+    summary = replay(RUNS[:5])
+    # 第3天未全部成功，第4天没有签到，第5天重新从1开始
+    assert summary.snapshot(date(2024, 3, 5))["streak"] == 1
+    assert summary.snapshot(date(2024, 3, 6))["streak"] == 1
+    assert summary.snapshot(date(2024, 3, 7))["streak"] == 0
+    streak = replay(RUNS[:3])
+    assert streak.snapshot(date(2024, 3, 3))["streak"] == 2
+    assert streak.snapshot(date(2024, 3, 4))["streak"] == 0
+
+
+def test_day_rollover_clears_today():
+    summary = replay(RUNS)
+    assert summary.snapshot(date(2024, 3, 6))["today"] == {"succeeded": 1, "failed": 1}
+    assert summary.snapshot(date(2024, 3, 7))["today"] == {"succeeded": 0, "failed": 0}
+    assert summary.attempted(date(2024, 3, 7)) == []
+    # 早于摘要日期的记录不再改变当天统计
+    summary.update([rec("2024-03-05", "c", "签到失败: 网络错误")])
+    assert summary.attempted(date(2024, 3, 6)) == ["a", "b"]
+
+
+def test_last_record_and_trend():
+    snapshot = replay(RUNS[:4]).snapshot(date(2024, 3, 3))
+    assert snapshot["last"] == {"date": "2024-03-03 09:30:01", "account": "b", "status": "签到失败: 需要验证码"}
+    # 趋势只取自签到成功的记录
+    assert snapshot["trend"] == {"date": "2024-03-02 11:30:00", "account": "b", "text": "连续打卡 2 天"}
+
+
+def test_from_history_matches_incremental_updates():
+    history = [record for records in RUNS for record in records]
+    for count in range(1, len(RUNS) + 1):
+        incremental = replay(RUNS[:count])
+        rebuilt = SignSummary.from_history(reversed(history[:sum(len(records) for records in RUNS[:count])]))
+        assert rebuilt.to_dict() == incremental.to_dict()
+        # 保存后恢复的摘要不变
+        assert SignSummary(incremental.to_dict()).to_dict() == incremental.to_dict()